@@ -5,7 +5,1064 @@ import os
 import csv
 import shutil
 import json
+import io
 import datetime
+import time
+import queue
+import logging
+import logging.handlers
+import threading
+import contextlib
+import functools
+import re
+import tempfile
+import itertools
+import concurrent.futures
+import hashlib
+import zlib
+import lzma
+import struct
+import array
+from urllib.request import pathname2url
+from collections import deque, namedtuple
+
+# Application data directory (log files, settings)
+APP_DIR = os.path.join(os.path.expanduser("~"), ".database_manager")
+LOG_FILE = os.path.join(APP_DIR, "operations.log")
+SETTINGS_FILE = os.path.join(APP_DIR, "settings.json")
+BACKUP_DIR = os.path.join(APP_DIR, "backups")
+LOG_BUFFER_SIZE = 5000            # Max log entries kept in memory
+LOG_FILE_MAX_BYTES = 1024 * 1024  # Rotate log file after 1 MB
+LOG_FILE_BACKUPS = 3              # Number of rotated log files kept
+LOG_PAGE_SIZE = 200               # Entries per page in the log viewer
+LOG_LEVELS = ["ALL", "DEBUG", "INFO", "WARNING", "ERROR"]
+
+LogEntry = namedtuple("LogEntry", "timestamp level operation database duration rows message")
+
+TRACE_BUFFER_SIZE = 100000        # Max spans kept by the tracer
+PERF_PANEL_SPANS = 300            # Recent spans shown in the performance panel
+DUMP_BATCH_SIZE = 5000            # Rows fetched per fetchmany() call while dumping
+DUMP_FORMATS = ["CSV", "NDJSON", "SQL"]
+QUERY_EXPORT_FORMATS = {"CSV": ".csv", "TSV": ".tsv", "NDJSON": ".ndjson"}
+CSV_SAMPLE_ROWS = 1000            # Rows sampled to infer column types on CSV import
+CSV_BATCH_ROWS = 10000            # Rows converted and inserted per executemany() batch
+CSV_TYPES = ["INTEGER", "REAL", "TEXT", "BLOB"]
+STRICT_SUPPORTED = sqlite3.sqlite_version_info >= (3, 37, 0)
+INDEX_HISTORY_QUERIES = 50       # Recent history queries checked for index usage
+INDEX_PROGRESS_STEPS = 1000000    # SQLite VM steps between index build progress reports
+GRID_TEXT_LIMIT = 200             # Longer TEXT values show as a prefix plus length in the grid
+BLOB_CHUNK_SIZE = 1024 * 1024     # Buffer size for streaming BLOB export/import
+BLOB_VIEW_PAGE = 4096             # Bytes shown per page in the BLOB viewer
+COPY_CHUNK_ROWS = 50000           # Rowid range copied per transaction by the table copier
+TREE_PAGE_SIZE = 500              # Objects inserted per page when a tree group is expanded
+TREE_FILTER_DELAY_MS = 300        # Type-ahead debounce for the object tree filter
+OBJECT_GROUPS = [("table", "Tables"), ("view", "Views"), ("index", "Indexes"), ("trigger", "Triggers")]
+BATCH_FETCH_ROWS = 500            # Rowids per "rowid IN (...)" query when refreshing batch edits
+BENCHMARK_ROWS = 200000           # Max rows scanned/sorted per profile benchmark
+BENCHMARK_WRITE_BATCHES = 20      # Committed batches in the write benchmark
+BENCHMARK_BATCH_ROWS = 1000       # Rows per write benchmark batch
+BACKUP_KEEP_SNAPSHOTS = 24        # Default snapshots kept per backup repository (0 keeps all)
+BACKUP_PROGRESS_PAGES = 2048      # Pages hashed/restored between progress reports
+BACKUP_CODECS = {"zlib": (zlib.compress, zlib.decompress), "lzma": (lzma.compress, lzma.decompress)}
+WATCH_INTERVAL_MS = 2000          # Default external change polling interval (0 disables)
+WATCH_IDLE_SECONDS = 300          # Pause change polling after this much user inactivity
+
+# Connection performance profiles; cache_size is negative KiB, mmap_size is bytes
+PERFORMANCE_PROFILES = {
+    "safe": {"mmap_size": 0, "cache_size": -2000, "temp_store": "DEFAULT",
+             "synchronous": "FULL", "journal_mode": "DELETE"},
+    "fast read": {"mmap_size": 268435456, "cache_size": -65536, "temp_store": "MEMORY",
+                  "synchronous": "NORMAL", "journal_mode": "WAL"},
+    "bulk load": {"mmap_size": 268435456, "cache_size": -262144, "temp_store": "MEMORY",
+                  "synchronous": "OFF", "journal_mode": "WAL"},
+}
+DEFAULT_PROFILE = "(sqlite defaults)"
+ACTIVE_PROFILES = {}              # Absolute database path -> profile name used by open_connection
+
+SpanRecord = namedtuple("SpanRecord", "name start duration depth thread_id args")
+
+
+# --------------------- Instrumentation --------------------- #
+class Span:
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stack = self.tracer.stack()
+        self.depth = len(stack)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.tracer.stack().pop()
+        if exc_type is not None:
+            self.args["error"] = str(exc)
+        self.tracer.records.append(SpanRecord(self.name, self.start - self.tracer.origin, duration,
+                                              self.depth, threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.records = deque(maxlen=TRACE_BUFFER_SIZE)
+        self.origin = time.perf_counter()
+        self.local = threading.local()
+
+    def stack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def span(self, name, **args):
+        # When disabled, a shared no-op context manager keeps overhead to one attribute check
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def clear(self):
+        self.records.clear()
+        self.origin = time.perf_counter()
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for record in list(self.records):
+            events.append({
+                "name": record.name,
+                "cat": record.name.split()[0],
+                "ph": "X",
+                "ts": round(record.start * 1e6, 3),
+                "dur": round(record.duration * 1e6, 3),
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": {key: str(value) for key, value in record.args.items()},
+            })
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+NULL_SPAN = contextlib.nullcontext()
+TRACER = Tracer()
+
+
+def traced(name):
+    # Wraps a whole user action in a span so its database and UI steps nest under it
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def open_connection(path, read_only=False):
+    # Read-only connections use a URI so they can be opened safely from worker threads
+    if read_only:
+        target, uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro", True
+    else:
+        target, uri = path, False
+    factory = TracedConnection if TRACER.enabled else sqlite3.Connection
+    with TRACER.span("connect", database=os.path.basename(path)):
+        conn = sqlite3.connect(target, uri=uri, factory=factory)
+        profile = ACTIVE_PROFILES.get(os.path.abspath(path))
+        if profile in PERFORMANCE_PROFILES:
+            apply_connection_profile(conn, PERFORMANCE_PROFILES[profile])
+    return conn
+
+
+# --------------------- Performance Profile Helpers --------------------- #
+def apply_connection_profile(conn, profile):
+    # Per-connection settings only; journal_mode is persistent and set once by set_journal_mode()
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+
+
+def set_journal_mode(path, profile):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def remove_database_files(path):
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def benchmark_profile(db_path, table, profile, scratch_path):
+    # Returns (scan seconds, sort seconds, write seconds) for one profile
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True)
+    try:
+        if profile is not None:
+            apply_connection_profile(conn, profile)
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        cursor.execute(f"SELECT * FROM {quote_ident(table)} LIMIT {BENCHMARK_ROWS}")
+        while cursor.fetchmany(DUMP_BATCH_SIZE):
+            pass
+        scan = time.perf_counter() - start
+        start = time.perf_counter()
+        cursor.execute(f"SELECT * FROM (SELECT * FROM {quote_ident(table)} LIMIT {BENCHMARK_ROWS}) ORDER BY random()")
+        while cursor.fetchmany(DUMP_BATCH_SIZE):
+            pass
+        sort = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    # Writes go to a scratch file beside the database so the real data is never modified
+    remove_database_files(scratch_path)
+    conn = sqlite3.connect(scratch_path)
+    try:
+        if profile is not None:
+            conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}").fetchone()
+            apply_connection_profile(conn, profile)
+        conn.execute("CREATE TABLE bench (id INTEGER PRIMARY KEY, value TEXT)")
+        conn.commit()
+        start = time.perf_counter()
+        for batch in range(BENCHMARK_WRITE_BATCHES):
+            conn.executemany("INSERT INTO bench (value) VALUES (?)",
+                             ((f"row {batch}-{i}",) for i in range(BENCHMARK_BATCH_ROWS)))
+            conn.commit()
+        write = time.perf_counter() - start
+    finally:
+        conn.close()
+        remove_database_files(scratch_path)
+    return scan, sort, write
+
+
+def run_profile_benchmark(db_path, progress_queue):
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True)
+    try:
+        # Benchmark against the largest table by page count when dbstat is available
+        try:
+            table = conn.execute("SELECT name FROM dbstat JOIN sqlite_master USING (name) WHERE type='table' "
+                                 "GROUP BY name ORDER BY SUM(pgsize) DESC LIMIT 1").fetchone()
+        except sqlite3.OperationalError:
+            table = conn.execute("SELECT name FROM sqlite_master WHERE type='table' "
+                                 "AND name NOT LIKE 'sqlite_%' LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    if table is None:
+        progress_queue.put(("error", "The database has no tables to benchmark"))
+        return
+    progress_queue.put(("table", table[0]))
+    scratch_path = db_path + ".benchmark"
+    try:
+        benchmark_profile(db_path, table[0], None, scratch_path)  # Warm the OS cache first
+        for name, profile in [(DEFAULT_PROFILE, None)] + list(PERFORMANCE_PROFILES.items()):
+            progress_queue.put(("result", name, benchmark_profile(db_path, table[0], profile, scratch_path)))
+    except Exception as e:
+        progress_queue.put(("error", str(e)))
+        return
+    progress_queue.put(("finished",))
+
+
+# --------------------- Database Dump Helpers --------------------- #
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def safe_filename(name):
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def export_value(value):
+    # BLOBs are written as hex with a \x prefix (bytea style) in CSV, TSV and NDJSON, so they stay distinguishable
+    # from text and load back as BLOBs through Import CSV as New Table; only the SQL format keeps them native
+    return "\\x" + value.hex() if isinstance(value, bytes) else value
+
+
+def write_rows(cursor, f, fmt, headers, cancel_event=None, on_batch=None):
+    # Streams a cursor to an open file in batches so memory stays flat; returns rows written
+    writer = csv.writer(f, delimiter="\t" if fmt == "TSV" else ",") if fmt in ("CSV", "TSV") else None
+    if writer is not None:
+        writer.writerow(headers)
+    total = 0
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        rows = cursor.fetchmany(DUMP_BATCH_SIZE)
+        if not rows:
+            break
+        with TRACER.span("file write", rows=len(rows)):
+            if writer is not None:
+                writer.writerows(map(export_value, row) for row in rows)
+            elif fmt == "NDJSON":
+                f.write("".join(json.dumps(dict(zip(headers, map(export_value, row))), ensure_ascii=False) + "\n"
+                                for row in rows))
+            else:
+                # SQL statements are already formatted by SQLite in the query itself
+                f.write("".join(row[0] + "\n" for row in rows))
+        total += len(rows)
+        if on_batch is not None:
+            on_batch(total)
+    return total
+
+
+def open_dump_snapshot(path, temp_dir=None):
+    # Returns (path workers should read, coordinator connection holding the snapshot or None).
+    # In rollback-journal mode an open read transaction keeps a SHARED lock, so no writer can
+    # commit until every worker is done. WAL readers would each see their own snapshot, so
+    # the database is first copied with the online backup API and workers read the copy.
+    # Called on a worker thread; the coordinator connection is released later on the UI thread.
+    # temp_dir chooses where the WAL copy goes (default: the system temp directory).
+    conn = sqlite3.connect(path, check_same_thread=False)
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    if journal_mode.lower() == "wal":
+        fd, snapshot_path = tempfile.mkstemp(suffix=".db", prefix="dump_snapshot_", dir=temp_dir)
+        os.close(fd)
+        dest = sqlite3.connect(snapshot_path)
+        with TRACER.span("snapshot backup"):
+            conn.backup(dest)
+        dest.close()
+        conn.close()
+        return snapshot_path, None
+    conn.execute("BEGIN")
+    conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+    return path, conn
+
+
+def prepare_dump(db_path, out_dir, result_queue):
+    # Takes the snapshot and writes schema.sql off the UI thread; reports ("ready", (path, conn, tables))
+    snapshot_path, snapshot_conn = None, None
+    try:
+        snapshot_path, snapshot_conn = open_dump_snapshot(db_path)
+        schema_conn = snapshot_conn or open_connection(snapshot_path, read_only=True)
+        cursor = schema_conn.cursor()
+        # Tables first so the DDL can be replayed in order; SQLite's own objects are recreated automatically
+        cursor.execute("SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+                       "ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END, rowid")
+        schema = cursor.fetchall()
+        if snapshot_conn is None:
+            schema_conn.close()
+        with open(os.path.join(out_dir, "schema.sql"), "w", encoding="utf-8") as f:
+            for obj_type, name, sql in schema:
+                f.write(sql + ";\n")
+        tables = [name for obj_type, name, sql in schema if obj_type == "table"]
+        result_queue.put(("ready", (snapshot_path, snapshot_conn, tables)))
+    except Exception as e:
+        if snapshot_conn is not None:
+            snapshot_conn.close()
+        elif snapshot_path is not None and snapshot_path != db_path:
+            os.remove(snapshot_path)
+        result_queue.put(("error", str(e)))
+
+
+def dump_table(db_path, table, out_dir, fmt, cancel_event, progress_queue):
+    with TRACER.span("dump table", table=table):
+        conn = open_connection(db_path, read_only=True)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"PRAGMA table_info({quote_ident(table)})")
+            headers = [col[1] for col in cursor.fetchall()]
+            if fmt == "SQL":
+                values = " || ',' || ".join(f"quote({quote_ident(col)})" for col in headers)
+                prefix = f"INSERT INTO {quote_ident(table)} VALUES("
+                cursor.execute(f"SELECT '{prefix.replace(chr(39), chr(39) * 2)}' || {values} || ');' "
+                               f"FROM {quote_ident(table)}")
+                extension = "sql"
+            else:
+                cursor.execute(f"SELECT * FROM {quote_ident(table)}")
+                extension = "csv" if fmt == "CSV" else "ndjson"
+            file_path = os.path.join(out_dir, f"{safe_filename(table)}.{extension}")
+            with open(file_path, "w", newline="", encoding="utf-8") as f:
+                return write_rows(cursor, f, fmt, headers, cancel_event,
+                                  lambda total: progress_queue.put(("rows", table, total)))
+        finally:
+            conn.close()
+
+
+def export_query(db_path, sql, out_path, fmt, cancel_event, progress_queue):
+    # Streams any row-returning statement to a file on a read-only connection, so the
+    # export can never modify the database; the partial file is removed on cancel or error
+    conn = None
+    total = 0
+    try:
+        conn = open_connection(db_path, read_only=True)
+        # Lets Cancel stop long sorts/joins before the first row is produced
+        conn.set_progress_handler(lambda: 1 if cancel_event.is_set() else 0, INDEX_PROGRESS_STEPS)
+        with TRACER.span("export query", format=fmt):
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            if cursor.description is None:
+                raise ValueError("The statement does not return any rows")
+            headers = [description[0] for description in cursor.description]
+            with open(out_path, "w", newline="", encoding="utf-8") as f:
+                total = write_rows(cursor, f, fmt, headers, cancel_event,
+                                   lambda rows: progress_queue.put(("rows", rows)))
+        if cancel_event.is_set():
+            raise sqlite3.OperationalError("interrupted")
+        progress_queue.put(("done", total))
+    except Exception as e:
+        with contextlib.suppress(OSError):
+            os.remove(out_path)
+        progress_queue.put(("cancelled", total) if cancel_event.is_set() else ("error", str(e)))
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# --------------------- Incremental Backup Helpers --------------------- #
+# A backup repository keeps one JSON manifest per snapshot plus a pack holding only the pages that
+# changed since the previous snapshot. Manifests map runs of pages to the pack that stores them.
+BACKUP_PAGE_ENTRY = struct.Struct("<IQI16s")  # Page number, offset in pack, compressed length, digest
+
+
+def page_digest(page):
+    return hashlib.blake2b(page, digest_size=16).digest()
+
+
+def backup_repository_path(db_path):
+    abs_path = os.path.abspath(db_path)
+    tag = hashlib.blake2b(abs_path.encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(BACKUP_DIR, f"{safe_filename(os.path.basename(abs_path))}-{tag}")
+
+
+def list_snapshots(repo):
+    snapshots = []
+    snap_dir = os.path.join(repo, "snapshots")
+    if os.path.isdir(snap_dir):
+        for name in sorted(os.listdir(snap_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(snap_dir, name), "r", encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+    return snapshots
+
+
+def expand_runs(runs, page_count):
+    owners = array.array("I", bytes(4 * page_count))
+    for start, count, pack_id in runs:
+        count = min(count, page_count - start)
+        if count > 0:
+            owners[start:start + count] = array.array("I", [pack_id]) * count
+    return owners
+
+
+def compress_runs(owners):
+    runs = []
+    start = 0
+    for page_no in range(1, len(owners) + 1):
+        if page_no == len(owners) or owners[page_no] != owners[start]:
+            runs.append([start, page_no - start, owners[start]])
+            start = page_no
+    return runs
+
+
+def pack_paths(repo, pack_id):
+    # Returns (pack path, index path, codec); packs can outlive the manifest that created them
+    base = os.path.join(repo, "packs", f"{pack_id:06d}")
+    for codec in BACKUP_CODECS:
+        if os.path.exists(f"{base}.{codec}"):
+            return f"{base}.{codec}", f"{base}.idx", codec
+    raise FileNotFoundError(f"Pack {pack_id} is missing from the backup repository")
+
+
+def read_page_size(path):
+    with open(path, "rb") as f:
+        header = f.read(100)
+    if len(header) < 100:
+        return 4096
+    page_size = struct.unpack(">H", header[16:18])[0]
+    return 65536 if page_size == 1 else page_size
+
+
+def uses_wal(path):
+    # File format version 2 in the header means the database is in WAL mode
+    with open(path, "rb") as f:
+        header = f.read(20)
+    return len(header) == 20 and header[18] == 2
+
+
+def create_snapshot(db_path, repo, codec, cancel_event, progress_queue):
+    start = time.perf_counter()
+    for sub_dir in ("snapshots", "packs"):
+        os.makedirs(os.path.join(repo, sub_dir), exist_ok=True)
+    snapshots = list_snapshots(repo)
+    parent = snapshots[-1] if snapshots else None
+    snap_id = parent["id"] + 1 if parent else 1
+    # A WAL database is staged as a full copy inside the repository, never in the (often small) temp dir
+    snapshot_path, snapshot_conn = open_dump_snapshot(db_path, temp_dir=repo)
+    try:
+        page_size = read_page_size(snapshot_path)
+        page_count = os.path.getsize(snapshot_path) // page_size
+        prev_hashes = b""
+        if parent and parent["page_size"] == page_size:
+            hashes_path = os.path.join(repo, f"hashes-{parent['id']:06d}.bin")
+            if os.path.exists(hashes_path):
+                with open(hashes_path, "rb") as f:
+                    prev_hashes = f.read()
+        owners = expand_runs(parent["runs"] if prev_hashes else [], page_count)
+        compress = BACKUP_CODECS[codec][0]
+        pack_path = os.path.join(repo, "packs", f"{snap_id:06d}.{codec}")
+        index_path = os.path.join(repo, "packs", f"{snap_id:06d}.idx")
+        hashes = bytearray()
+        changed = stored = 0
+        with TRACER.span("snapshot pages", pages=page_count), open(snapshot_path, "rb") as src, \
+                open(pack_path, "wb") as pack, open(index_path, "wb") as index:
+            for page_no in range(page_count):
+                if cancel_event.is_set():
+                    break
+                page = src.read(page_size)
+                digest = page_digest(page)
+                hashes += digest
+                if prev_hashes[page_no * 16:page_no * 16 + 16] != digest:
+                    data = compress(page)
+                    index.write(BACKUP_PAGE_ENTRY.pack(page_no, pack.tell(), len(data), digest))
+                    pack.write(data)
+                    owners[page_no] = snap_id
+                    changed += 1
+                    stored += len(data)
+                if page_no % BACKUP_PROGRESS_PAGES == 0:
+                    progress_queue.put(("progress", page_no / page_count))
+    finally:
+        if snapshot_conn is not None:
+            snapshot_conn.rollback()
+            snapshot_conn.close()
+        elif snapshot_path != db_path:
+            os.remove(snapshot_path)
+    if cancel_event.is_set() or not changed:
+        os.remove(pack_path)
+        os.remove(index_path)
+    if cancel_event.is_set():
+        return None
+    manifest = {"id": snap_id, "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "source": os.path.abspath(db_path), "page_size": page_size, "page_count": page_count,
+                "codec": codec, "changed_pages": changed, "stored_bytes": stored,
+                "read_bytes": page_count * page_size, "seconds": time.perf_counter() - start,
+                "runs": compress_runs(owners)}
+    # The manifest is renamed into place last, so an interrupted snapshot never shows up
+    manifest_path = os.path.join(repo, "snapshots", f"{snap_id:06d}.json")
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    with open(os.path.join(repo, f"hashes-{snap_id:06d}.bin"), "wb") as f:
+        f.write(hashes)
+    if parent:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(repo, f"hashes-{parent['id']:06d}.bin"))
+    return manifest
+
+
+def restore_snapshot(repo, snapshot, dest_path, cancel_event, progress_queue):
+    start = time.perf_counter()
+    page_size, page_count = snapshot["page_size"], snapshot["page_count"]
+    owners = expand_runs(snapshot["runs"], page_count)
+    temp_path = dest_path + ".restoring"
+    written = 0
+    try:
+        with TRACER.span("restore pages", pages=page_count), open(temp_path, "wb") as out:
+            out.truncate(page_count * page_size)
+            for pack_id in sorted({pack_id for start_page, count, pack_id in snapshot["runs"]}):
+                pack_path, index_path, codec = pack_paths(repo, pack_id)
+                decompress = BACKUP_CODECS[codec][1]
+                with open(pack_path, "rb") as pack, open(index_path, "rb") as index:
+                    while not cancel_event.is_set():
+                        entries = index.read(BACKUP_PAGE_ENTRY.size * BACKUP_PROGRESS_PAGES)
+                        if not entries:
+                            break
+                        for page_no, offset, length, digest in BACKUP_PAGE_ENTRY.iter_unpack(entries):
+                            if page_no >= page_count or owners[page_no] != pack_id:
+                                continue  # Superseded by a later pack
+                            pack.seek(offset)
+                            page = decompress(pack.read(length))
+                            if page_digest(page) != digest:
+                                raise ValueError(f"Page {page_no} in pack {pack_id} failed its checksum")
+                            out.seek(page_no * page_size)
+                            out.write(page)
+                            written += 1
+                        progress_queue.put(("progress", written / max(1, page_count)))
+    except Exception:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+    if cancel_event.is_set():
+        os.remove(temp_path)
+        return None
+    if written != page_count:
+        os.remove(temp_path)
+        raise ValueError(f"Snapshot {snapshot['id']} is incomplete: {written} of {page_count} pages found")
+    os.replace(temp_path, dest_path)
+    return {"pages": written, "bytes": written * page_size, "seconds": time.perf_counter() - start}
+
+
+def prune_snapshots(repo, keep):
+    # Drops manifests beyond the newest `keep` and deletes packs no remaining manifest references
+    snapshots = list_snapshots(repo)
+    if keep <= 0 or len(snapshots) <= keep:
+        return 0, 0
+    for snapshot in snapshots[:-keep]:
+        os.remove(os.path.join(repo, "snapshots", f"{snapshot['id']:06d}.json"))
+    referenced = {pack_id for snapshot in snapshots[-keep:] for start, count, pack_id in snapshot["runs"]}
+    freed = 0
+    packs_dir = os.path.join(repo, "packs")
+    for name in os.listdir(packs_dir):
+        if int(name.split(".")[0]) not in referenced:
+            path = os.path.join(packs_dir, name)
+            freed += os.path.getsize(path)
+            os.remove(path)
+    return len(snapshots) - keep, freed
+
+
+def run_backup_job(job, args, progress_queue):
+    # Worker entry point: reports ("done", result) or ("error", message) when the job ends
+    try:
+        progress_queue.put(("done", job(*args)))
+    except Exception as e:
+        progress_queue.put(("error", str(e)))
+
+
+# --------------------- CSV Type Inference Helpers --------------------- #
+INT_PATTERN = re.compile(r"^[+-]?(0|[1-9][0-9]*)$")
+REAL_PATTERN = re.compile(r"^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?$")
+HEX_BLOB_PATTERN = re.compile(r"^(?:0x|\\x)((?:[0-9a-fA-F]{2})+)$")
+LEADING_ZERO_PATTERN = re.compile(r"^[+-]?0[0-9]")
+SQLITE_INT_MIN, SQLITE_INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def fits_sqlite_int(value):
+    return SQLITE_INT_MIN <= int(value) <= SQLITE_INT_MAX
+
+
+def infer_column_type(values):
+    # Empty strings are loaded as NULL, so they do not vote; numbers with leading zeros stay TEXT
+    present = [value for value in values if value != ""]
+    if not present:
+        return "TEXT"
+    if any(LEADING_ZERO_PATTERN.match(value) for value in present):
+        return "TEXT"  # Codes such as zip or phone numbers
+    if any(INT_PATTERN.match(value) and not fits_sqlite_int(value) for value in present):
+        return "TEXT"  # Beyond 64 bits: REAL would silently drop digits
+    if all(INT_PATTERN.match(value) for value in present):
+        return "INTEGER"
+    if all(REAL_PATTERN.match(value) for value in present):
+        return "REAL"
+    if all(HEX_BLOB_PATTERN.match(value) for value in present):
+        return "BLOB"
+    return "TEXT"
+
+
+def csv_converter(col_type):
+    # Values that do not fit the column type are kept as text rather than failing the whole load
+    def to_int(value):
+        if value == "":
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            return value
+        return number if SQLITE_INT_MIN <= number <= SQLITE_INT_MAX else value
+
+    def to_real(value):
+        if value == "":
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    def to_blob(value):
+        match = HEX_BLOB_PATTERN.match(value)
+        if match:
+            return bytes.fromhex(match.group(1))
+        return None if value == "" else value
+
+    def to_text(value):
+        return None if value == "" else value
+
+    return {"INTEGER": to_int, "REAL": to_real, "BLOB": to_blob}.get(col_type, to_text)
+
+
+def sample_csv(file_path):
+    with open(file_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        headers = next(reader)
+        sample = list(itertools.islice(reader, CSV_SAMPLE_ROWS))
+    names, seen = [], set()
+    for i, name in enumerate(headers):
+        name = name.strip() or f"column{i + 1}"
+        while name.lower() in seen:  # SQLite column names are case-insensitive
+            name += "_"
+        names.append(name)
+        seen.add(name.lower())
+    types = [infer_column_type([row[i] if i < len(row) else "" for row in sample]) for i in range(len(names))]
+    return names, types
+
+
+def create_table_sql(table, names, types, primary_key=None, without_rowid=False, strict=False):
+    definitions = [f"{quote_ident(name)} {col_type}" for name, col_type in zip(names, types)]
+    if primary_key:
+        definitions.append(f"PRIMARY KEY ({quote_ident(primary_key)})")
+    options = [option for option, enabled in (("WITHOUT ROWID", without_rowid), ("STRICT", strict)) if enabled]
+    return f"CREATE TABLE {quote_ident(table)} ({', '.join(definitions)}) {', '.join(options)}".strip()
+
+
+def import_csv_file(db_path, file_path, table, names, types, create_sql, index_columns, progress_queue):
+    # Creates the table, bulk loads converted batches in one transaction, then builds indexes
+    start = time.perf_counter()
+    file_size = max(1, os.path.getsize(file_path))
+    converters = [csv_converter(col_type) for col_type in types]
+    column_count = len(names)
+    insert = (f"INSERT INTO {quote_ident(table)} ({', '.join(quote_ident(name) for name in names)}) "
+              f"VALUES ({', '.join(['?'] * column_count)})")
+    conn = open_connection(db_path)
+    created = False
+    try:
+        cursor = conn.cursor()
+        cursor.execute(create_sql)
+        created = True
+        total = 0
+        # csv.reader drives the text wrapper with next(), which disables tell(); progress is
+        # taken from the underlying binary file instead
+        with open(file_path, "rb") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader)
+            while True:
+                with TRACER.span("file read", rows=CSV_BATCH_ROWS):
+                    rows = list(itertools.islice(reader, CSV_BATCH_ROWS))
+                if not rows:
+                    break
+                # Work column by column: one converter applied with map() over each column of the batch
+                rows = [row[:column_count] if len(row) >= column_count else row + [""] * (column_count - len(row))
+                        for row in rows]
+                columns = [list(map(convert, column)) for convert, column in zip(converters, zip(*rows))]
+                cursor.executemany(insert, zip(*columns))
+                total += len(rows)
+                progress_queue.put(("progress", raw.tell() / file_size, total))
+        for column in index_columns:
+            progress_queue.put(("status", f"Creating index on {column}", total))
+            index_name = quote_ident(f"idx_{table}_{column}")
+            cursor.execute(f"CREATE INDEX {index_name} ON {quote_ident(table)} ({quote_ident(column)})")
+        conn.commit()
+        progress_queue.put(("done", time.perf_counter() - start, total))
+    except Exception as e:
+        conn.rollback()
+        # DDL runs outside the implicit transaction, so remove the half-created table
+        if created:
+            conn.execute(f"DROP TABLE IF EXISTS {quote_ident(table)}")
+        progress_queue.put(("error", str(e), 0))
+    finally:
+        conn.close()
+
+
+# --------------------- Index Helpers --------------------- #
+def index_where_clause(sql):
+    match = re.search(r"\bWHERE\b(.*)$", sql or "", re.IGNORECASE | re.DOTALL)
+    return match.group(1).strip() if match else ""
+
+
+def table_indexes(cursor, table):
+    # Returns one dict per index: name, columns, unique, origin and partial WHERE clause
+    cursor.execute(f"PRAGMA index_list({quote_ident(table)})")
+    index_list = cursor.fetchall()
+    indexes = []
+    for seq, name, unique, origin, partial in index_list:
+        cursor.execute(f"PRAGMA index_info({quote_ident(name)})")
+        columns = [col[2] if col[2] is not None else "<expr>" for col in cursor.fetchall()]
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='index' AND name=?", (name,))
+        row = cursor.fetchone()
+        indexes.append({
+            "name": name,
+            "columns": columns,
+            "unique": bool(unique),
+            "origin": {"c": "CREATE INDEX", "u": "UNIQUE constraint", "pk": "PRIMARY KEY"}.get(origin, origin),
+            "where": index_where_clause(row[0]) if partial and row else "",
+        })
+    return indexes
+
+
+def index_usage_report(db_path, index_names, queries, progress_queue):
+    # Runs in a worker thread: on-disk size from dbstat and EXPLAIN QUERY PLAN over recent queries
+    conn = None
+    try:
+        conn = open_connection(db_path, read_only=True)
+        cursor = conn.cursor()
+        usage = {name: [] for name in index_names}
+        for sql in queries:
+            try:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+            except sqlite3.Error:
+                continue
+            for name in index_names:
+                if re.search(rf"\bINDEX {re.escape(name)}\b", plan):
+                    usage[name].append(sql)
+        progress_queue.put(("usage", usage))
+        for name in index_names:
+            try:
+                cursor.execute("SELECT SUM(pgsize) FROM dbstat WHERE name=?", (name,))
+                size = cursor.fetchone()[0] or 0
+            except sqlite3.OperationalError:
+                size = None  # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+            progress_queue.put(("size", name, size))
+    except sqlite3.Error as e:
+        progress_queue.put(("error", str(e)))
+    finally:
+        if conn is not None:
+            conn.close()
+        progress_queue.put(("finished",))
+
+
+def build_index(db_path, create_sql, conn_holder, progress_queue):
+    # conn_holder lets the UI thread call interrupt() on this worker's connection to cancel
+    start = time.perf_counter()
+    conn = open_connection(db_path)
+    conn_holder.append(conn)
+    steps = [0]
+
+    def report():
+        steps[0] += 1
+        progress_queue.put(("progress", steps[0] * INDEX_PROGRESS_STEPS, time.perf_counter() - start))
+        return 0
+
+    try:
+        conn.set_progress_handler(report, INDEX_PROGRESS_STEPS)
+        with TRACER.span("create index", sql=create_sql):
+            conn.execute(create_sql)
+            conn.commit()
+        progress_queue.put(("done", None, time.perf_counter() - start))
+    except sqlite3.Error as e:
+        progress_queue.put(("error", str(e), time.perf_counter() - start))
+    finally:
+        conn.close()
+
+
+def format_size(size):
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+# --------------------- Object Tree Helpers --------------------- #
+def like_pattern(term):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def collect_table_stats(db_path, names, generation, is_current, results):
+    # Runs in a worker thread; stops early once the tree has been reloaded
+    conn = open_connection(db_path, read_only=True)
+    try:
+        for name in names:
+            if not is_current(generation):
+                break
+            try:
+                count = conn.execute(f"SELECT COUNT(*) FROM {quote_ident(name)}").fetchone()[0]
+            except sqlite3.Error:
+                count = None
+            try:
+                size = conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name=?", (name,)).fetchone()[0]
+            except sqlite3.Error:
+                size = None
+            results.put((generation, name, count, size))
+    finally:
+        conn.close()
+
+
+# --------------------- Large Value Helpers --------------------- #
+def table_has_rowid(cursor, name):
+    # Only ordinary tables have rowids; views return NULL for rowid instead of raising
+    cursor.execute("SELECT type, sql FROM sqlite_master WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    if row is None or row[0] != "table" or not row[1]:
+        return False
+    # Table options (WITHOUT ROWID, STRICT) follow the closing parenthesis of the column list
+    return not re.search(r"\bWITHOUT\s+ROWID\b", row[1].rsplit(")", 1)[-1], re.IGNORECASE)
+
+
+def grid_column_expr(column):
+    # BLOBs become a size placeholder and long TEXT a prefix, so the grid never holds whole values
+    col = quote_ident(column)
+    return (f"CASE WHEN typeof({col}) = 'blob' THEN '<BLOB ' || length({col}) || ' bytes>' "
+            f"WHEN typeof({col}) = 'text' AND length({col}) > {GRID_TEXT_LIMIT} "
+            f"THEN substr({col}, 1, {GRID_TEXT_LIMIT}) || '... <' || length({col}) || ' chars>' "
+            f"ELSE {col} END")
+
+
+GRID_PLACEHOLDER_PATTERN = re.compile(r"^(?:<BLOB (\d+) bytes>|.*\.\.\. <(\d+) chars>)$", re.DOTALL)
+
+
+def grid_placeholder(value):
+    # Returns (type, length) when a grid value is a grid_column_expr placeholder, else None
+    match = GRID_PLACEHOLDER_PATTERN.match(value) if isinstance(value, str) else None
+    if match is None:
+        return None
+    return ("blob", int(match.group(1))) if match.group(1) else ("text", int(match.group(2)))
+
+
+def sniff_blob_type(header):
+    signatures = ((b"\x89PNG", "PNG image"), (b"\xff\xd8\xff", "JPEG image"), (b"GIF8", "GIF image"),
+                  (b"%PDF", "PDF document"), (b"PK\x03\x04", "ZIP archive"), (b"\x1f\x8b", "gzip data"),
+                  (b"SQLite format 3", "SQLite database"))
+    for signature, name in signatures:
+        if header.startswith(signature):
+            return name
+    try:
+        header.decode("utf-8")
+        return "text"
+    except UnicodeDecodeError:
+        return "binary"
+
+
+def hex_dump(data, offset):
+    lines = []
+    for i in range(0, len(data), 16):
+        chunk = data[i:i + 16]
+        ascii_text = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{offset + i:08x}  {chunk.hex(' '):<47}  {ascii_text}")
+    return "\n".join(lines)
+
+
+# --------------------- Table Copy Helpers --------------------- #
+def copy_table(cursor, table, where, append, chunk_size, cancel_event, report):
+    # Copies one table from the attached "src" schema into main; returns rows copied
+    src_table, main_table = f"src.{quote_ident(table)}", f"main.{quote_ident(table)}"
+    cursor.execute("SELECT sql FROM main.sqlite_master WHERE type='table' AND name=?", (table,))
+    exists = cursor.fetchone() is not None
+    if exists and not append:
+        raise ValueError("table already exists in the destination database")
+    if not exists:
+        cursor.execute("SELECT sql FROM src.sqlite_master WHERE type='table' AND name=?", (table,))
+        cursor.execute(cursor.fetchone()[0])
+
+    cursor.execute(f"PRAGMA src.table_info({quote_ident(table)})")
+    columns = ", ".join(quote_ident(col[1]) for col in cursor.fetchall())
+    insert = f"INSERT INTO {main_table} ({columns}) SELECT {columns} FROM {src_table}"
+    condition = f" AND ({where})" if where else ""
+    copied = 0
+    try:
+        cursor.execute(f"SELECT rowid FROM {src_table} LIMIT 1")
+        has_rowid = True
+    except sqlite3.OperationalError:
+        has_rowid = False  # WITHOUT ROWID: copy in one statement
+        cursor.execute("BEGIN")
+        cursor.execute(insert + (f" WHERE {where}" if where else ""))
+        copied = cursor.rowcount
+        cursor.execute("COMMIT")
+        report(1.0, copied)
+    if has_rowid:
+        # Chunks are keyset ranges of chunk_size source rows, so sparse rowids cost nothing extra;
+        # each range is its own transaction so progress is visible and cancel keeps finished chunks
+        cursor.execute(f"SELECT COUNT(*) FROM {src_table}")
+        total_rows = max(1, cursor.fetchone()[0])
+        scanned = 0
+        last = None
+        while not cancel_event.is_set():
+            lower, params = ("", ()) if last is None else ("rowid > ? AND ", (last,))
+            cursor.execute(f"SELECT rowid FROM {src_table} WHERE {lower}1 ORDER BY rowid LIMIT 1 OFFSET ?",
+                           params + (chunk_size - 1,))
+            row = cursor.fetchone()
+            end = row[0] if row else None
+            upper, end_params = ("", ()) if end is None else ("rowid <= ? AND ", (end,))
+            cursor.execute("BEGIN")
+            cursor.execute(insert + f" WHERE {lower}{upper}1{condition}", params + end_params)
+            copied += cursor.rowcount
+            cursor.execute("COMMIT")
+            if end is None:
+                report(1.0, copied)
+                break
+            scanned += chunk_size
+            last = end
+            report(min(1.0, scanned / total_rows), copied)
+
+    # Indexes are built after the bulk load, skipping any that already exist
+    cursor.execute("SELECT name, sql FROM src.sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                   (table,))
+    for name, sql in cursor.fetchall():
+        cursor.execute("SELECT 1 FROM main.sqlite_master WHERE type='index' AND name=?", (name,))
+        if cursor.fetchone() is None:
+            cursor.execute(sql)
+    return copied
+
+
+def copy_tables(dest_path, source_path, tables, where, append, chunk_size, cancel_event, progress_queue):
+    conn = open_connection(dest_path)
+    conn.isolation_level = None  # Transactions are managed explicitly per chunk
+    try:
+        cursor = conn.cursor()
+        cursor.execute("ATTACH DATABASE ? AS src", (source_path,))
+        for table in tables:
+            if cancel_event.is_set():
+                break
+            try:
+                with TRACER.span("copy table", table=table):
+                    copy_table(cursor, table, where, append, chunk_size, cancel_event,
+                               lambda fraction, rows: progress_queue.put(("progress", table, (fraction, rows))))
+                progress_queue.put(("done", table, None))
+            except Exception as e:
+                if conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                progress_queue.put(("error", table, str(e)))
+        cursor.execute("DETACH DATABASE src")
+    finally:
+        conn.close()
+        progress_queue.put(("finished", None, None))
+
+
+class TracedCursor(sqlite3.Cursor):
+    def execute(self, sql, *params):
+        name = "PRAGMA" if sql.lstrip()[:6].upper() == "PRAGMA" else "execute"
+        with TRACER.span(name, sql=sql[:200]):
+            return super().execute(sql, *params)
+
+    def executemany(self, sql, seq_of_params):
+        with TRACER.span("executemany", sql=sql[:200]):
+            return super().executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        with TRACER.span("executescript"):
+            return super().executescript(script)
+
+    def fetchone(self):
+        with TRACER.span("fetch", size=1):
+            return super().fetchone()
+
+    def fetchmany(self, *size):
+        with TRACER.span("fetch") as span:
+            rows = super().fetchmany(*size)
+            if span is not None:
+                span.args["rows"] = len(rows)
+            return rows
+
+    def fetchall(self):
+        with TRACER.span("fetch") as span:
+            rows = super().fetchall()
+            if span is not None:
+                span.args["rows"] = len(rows)
+            return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def commit(self):
+        with TRACER.span("commit"):
+            return super().commit()
+
+    # Connection.execute* build their cursor internally without calling cursor(), so route them through it
+    def execute(self, sql, *params):
+        return self.cursor().execute(sql, *params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
 
 class DataManager:
     def __init__(self, root):
@@ -18,8 +1075,24 @@ class DataManager:
 
         # Additional attributes
         self.query_history = []        # Stores executed queries
-        self.log = []                  # Stores log messages
+        self.log = deque(maxlen=LOG_BUFFER_SIZE)  # Ring buffer of LogEntry records
+        self.logger, self.log_listener = self.setup_file_logger()
         self.last_operation = None     # Stores last operation for undo
+        self.all_rows = {}             # Grid item id -> row values, for searching/filtering
+        self.grid_has_rowid = False    # True when grid item ids are table rowids (enables row patching)
+        self.grid_select = "*"         # Column expressions used to fetch grid rows
+
+        # External change watcher state
+        self.watch_conn = None         # Dedicated connection for PRAGMA data_version polling
+        self.watch_job = None          # Pending root.after() id
+        self.watch_interval = WATCH_INTERVAL_MS
+        self.watch_signature = None    # (db mtime, db size, wal mtime, wal size)
+        self.watch_versions = None     # (schema_version, data_version)
+        self.last_activity = time.monotonic()
+
+        # Persistent settings (performance profile per database, watcher interval)
+        self.settings = self.load_settings()
+        self.watch_interval = self.settings.get("watch_interval", WATCH_INTERVAL_MS)
         self.dark_mode = False         # Flag for dark mode
 
         # Create menu bar
@@ -32,17 +1105,21 @@ class DataManager:
         self.file_menu.add_separator()
         self.file_menu.add_command(label="Run Query", command=self.run_query_window)
         self.file_menu.add_command(label="Backup Database", command=self.backup_database)
+        self.file_menu.add_command(label="Incremental Backups", command=self.show_backup_repository)
         self.file_menu.add_command(label="Import CSV", command=self.import_csv_to_table)
+        self.file_menu.add_command(label="Import CSV as New Table", command=self.import_csv_new_table_dialog)
+        self.file_menu.add_command(label="Copy Tables From Database", command=self.copy_tables_dialog)
         self.file_menu.add_separator()
         self.file_menu.add_command(label="About", command=self.show_about)
         self.file_menu.add_command(label="Changelog", command=self.show_changelog)
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="Exit", command=root.quit)
+        self.file_menu.add_command(label="Exit", command=self.exit_app)
         self.menu_bar.add_cascade(label="File", menu=self.file_menu)
 
         # ------------------- Tools Menu ------------------- #
         self.tools_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.tools_menu.add_command(label="Export Schema", command=self.export_schema)
+        self.tools_menu.add_command(label="Dump Database", command=self.dump_database_dialog)
         self.tools_menu.add_command(label="Run SQL Script", command=self.run_sql_script)
         self.tools_menu.add_command(label="Import JSON", command=self.import_json)
         self.tools_menu.add_command(label="Generate Sample Data", command=self.generate_sample_data)
@@ -51,6 +1128,9 @@ class DataManager:
         self.tools_menu.add_command(label="Database Summary", command=self.show_database_summary)
         self.tools_menu.add_command(label="Toggle Dark Mode", command=self.toggle_dark_mode)
         self.tools_menu.add_command(label="Reset Filters", command=self.reset_filters)
+        self.tools_menu.add_command(label="Performance Panel", command=self.show_performance_panel)
+        self.tools_menu.add_command(label="Change Watcher Interval", command=self.change_watcher_settings)
+        self.tools_menu.add_command(label="Performance Profile", command=self.show_profile_dialog)
         self.menu_bar.add_cascade(label="Tools", menu=self.tools_menu)
 
         # ------------------- Predefined Queries Menu ------------------- #
@@ -66,6 +1146,9 @@ class DataManager:
         self.menu_bar.add_cascade(label="Help", menu=self.help_menu)
 
         self.root.config(menu=self.menu_bar)
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>", "<Motion>"):
+            self.root.bind_all(sequence, self.note_activity, add="+")
 
         # ------------------- Main Frame ------------------- #
         self.main_frame = ttk.Frame(root)
@@ -81,13 +1164,29 @@ class DataManager:
         self.left_frame = ttk.Frame(self.main_frame)
         self.left_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
 
-        # Tables List
-        self.tables_frame = ttk.LabelFrame(self.left_frame, text="Tables")
+        # Database Objects (grouped by type, loaded lazily, filterable)
+        self.tables_frame = ttk.LabelFrame(self.left_frame, text="Database Objects")
         self.tables_frame.pack(fill=tk.BOTH, expand=True)
-        self.tables_tree = ttk.Treeview(self.tables_frame, height=15)
+        self.tree_filter_var = tk.StringVar()
+        self.tree_filter_entry = ttk.Entry(self.tables_frame, textvariable=self.tree_filter_var)
+        self.tree_filter_entry.pack(fill=tk.X, padx=2, pady=2)
+        self.tree_filter_entry.bind("<KeyRelease>", self.schedule_tree_filter)
+        self.tree_filter_job = None
+        self.tree_generation = 0       # Bumped on every reload so stale background stats are dropped
+        self.tree_page_after = {}      # Object type -> last name loaded, for "Load more..."
+        self.tree_stats_queue = queue.Queue()
+        self.tree_stats_threads = []
+        self.tables_tree = ttk.Treeview(self.tables_frame, height=15, columns=("rows", "size"))
+        self.tables_tree.heading("#0", text="Name")
+        self.tables_tree.heading("rows", text="Rows")
+        self.tables_tree.heading("size", text="Size")
+        self.tables_tree.column("#0", width=180)
+        self.tables_tree.column("rows", width=70, anchor="e")
+        self.tables_tree.column("size", width=70, anchor="e")
         self.tables_tree.pack(fill=tk.BOTH, expand=True)
         # Bind left-click for loading data and right-click for table sidebar
         self.tables_tree.bind("<<TreeviewSelect>>", self.load_table_data)
+        self.tables_tree.bind("<<TreeviewOpen>>", self.expand_object_group)
         self.tables_tree.bind("<Button-3>", self.show_table_sidebar)
 
         # Table Controls (Create, Delete, and Refresh)
@@ -135,6 +1234,25 @@ class DataManager:
         self.refresh_data_btn.pack(side=tk.LEFT, padx=2)
         self.export_data_btn = ttk.Button(self.data_controls, text="Export Table to CSV", command=self.export_table_csv)
         self.export_data_btn.pack(side=tk.LEFT, padx=2)
+        self.batch_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.data_controls, text="Batch Edit", variable=self.batch_mode,
+                        command=self.toggle_batch_mode).pack(side=tk.LEFT, padx=2)
+
+        # Batch editing controls (shown while Batch Edit is on)
+        self.pending_updates = {}      # rowid item id -> {column: new value}
+        self.pending_inserts = {}      # temporary item id -> {column: value}
+        self.pending_deletes = set()   # rowid item ids marked for deletion
+        self.pending_counter = 0
+        self.batch_controls = ttk.Frame(self.data_frame)
+        ttk.Button(self.batch_controls, text="Add Row", command=self.batch_add_row).pack(side=tk.LEFT, padx=2)
+        ttk.Button(self.batch_controls, text="Mark Delete", command=self.batch_mark_delete).pack(side=tk.LEFT, padx=2)
+        ttk.Button(self.batch_controls, text="Apply Changes", command=self.apply_pending_changes).pack(side=tk.LEFT, padx=2)
+        ttk.Button(self.batch_controls, text="Discard Changes", command=self.discard_pending_changes).pack(side=tk.LEFT, padx=2)
+        self.pending_label = ttk.Label(self.batch_controls, text="No pending changes")
+        self.pending_label.pack(side=tk.LEFT, padx=10)
+        self.data_tree.tag_configure("dirty", background="#fff3b0")
+        self.data_tree.tag_configure("inserted", background="#d4f7d4")
+        self.data_tree.tag_configure("deleted", background="#f7d4d4")
 
         # Additional friendly feature: Status Bar
         self.status_var = tk.StringVar(value="Ready")
@@ -142,16 +1260,272 @@ class DataManager:
         self.status_bar.pack(fill=tk.X, padx=2, pady=(2,0))
 
     # --------------------- Logging Helper --------------------- #
-    def log_operation(self, message):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] {message}"
+    def setup_file_logger(self):
+        # File writes happen on the QueueListener thread so logging never blocks the UI
+        logger = logging.getLogger("database_manager")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.handlers.clear()
+        try:
+            os.makedirs(APP_DIR, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES,
+                                                                backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+        except OSError:
+            logger.addHandler(logging.NullHandler())
+            return logger, None
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        log_queue = queue.Queue(-1)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        return logger, listener
+
+    def log_operation(self, message, level="INFO", operation=None, duration=None, rows=None):
+        entry = LogEntry(
+            timestamp=datetime.datetime.now(),
+            level=level,
+            operation=operation or "",
+            database=os.path.basename(self.current_db) if self.current_db else "",
+            duration=duration,
+            rows=rows,
+            message=message,
+        )
         self.log.append(entry)
-        print(entry)
+        self.logger.log(getattr(logging, level, logging.INFO), self.format_log_entry(entry))
+
+    def format_log_entry(self, entry):
+        timestamp = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        details = []
+        if entry.duration is not None:
+            details.append(f"{entry.duration * 1000:.1f} ms")
+        if entry.rows is not None:
+            details.append(f"{entry.rows} rows")
+        text = f"[{timestamp}] {entry.level:<7} {entry.operation or '-'} [{entry.database or '-'}] {entry.message}"
+        if details:
+            text += f" ({', '.join(details)})"
+        return text
+
+    def exit_app(self):
+        self.stop_change_watcher()
+        if self.log_listener is not None:
+            self.log_listener.stop()  # Flush pending log records to disk
+            self.log_listener = None
+        self.root.quit()
+
+    # --------------------- Connection Helper --------------------- #
+    def connect_db(self, path=None, read_only=False):
+        return open_connection(path or self.current_db, read_only)
+
+    # --------------------- External Change Watcher --------------------- #
+    def start_change_watcher(self):
+        self.stop_change_watcher()
+        if not self.current_db or self.watch_interval <= 0:
+            return
+        try:
+            self.watch_conn = sqlite3.connect(self.current_db)
+        except sqlite3.Error as e:
+            self.log_operation(f"Change watcher unavailable: {e}", level="WARNING", operation="watch")
+            return
+        self.sync_change_watcher()
+        self.watch_job = self.root.after(self.watch_interval, self.poll_external_changes)
+
+    def stop_change_watcher(self):
+        if self.watch_job is not None:
+            self.root.after_cancel(self.watch_job)
+            self.watch_job = None
+        if self.watch_conn is not None:
+            self.watch_conn.close()
+            self.watch_conn = None
+
+    def database_file_signature(self):
+        signature = []
+        for path in (self.current_db, self.current_db + "-wal"):
+            try:
+                stat = os.stat(path)
+                signature += [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                signature += [None, None]
+        return tuple(signature)
+
+    def read_database_versions(self):
+        # data_version only changes for commits made by other connections, including this app's own
+        return (self.watch_conn.execute("PRAGMA schema_version").fetchone()[0],
+                self.watch_conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def sync_change_watcher(self):
+        # Called whenever the UI has just been brought up to date, so our own writes are not re-detected
+        if self.watch_conn is None:
+            return
+        try:
+            self.watch_signature = self.database_file_signature()
+            self.watch_versions = self.read_database_versions()
+        except sqlite3.Error:
+            pass
+
+    def note_activity(self, event=None):
+        self.last_activity = time.monotonic()
+
+    def poll_external_changes(self):
+        self.watch_job = self.root.after(self.watch_interval, self.poll_external_changes)
+        # Stay cheap: skip while minimized or idle, and only query SQLite when the files changed
+        if self.root.state() == "iconic" or time.monotonic() - self.last_activity > WATCH_IDLE_SECONDS:
+            return
+        if self.has_pending_changes():
+            return  # Never reload over unsaved batch edits; the change is picked up after they are applied
+        signature = self.database_file_signature()
+        if signature == self.watch_signature:
+            return
+        self.watch_signature = signature
+        try:
+            versions = self.read_database_versions()
+        except sqlite3.Error:
+            return
+        if versions == self.watch_versions:
+            return
+        schema_changed = self.watch_versions is None or versions[0] != self.watch_versions[0]
+        self.watch_versions = versions
+        self.log_operation("External schema change detected" if schema_changed else "External data change detected",
+                           operation="watch")
+        if schema_changed:
+            self.load_tables()
+            if self.current_table and not self.object_exists(self.current_table):
+                self.current_table = None
+                self.data_tree.delete(*self.data_tree.get_children())
+                self.all_rows = {}
+            elif self.current_table:
+                self.load_table_data(None)
+        elif self.current_table:
+            self.load_table_data(None)
+
+    def change_watcher_settings(self):
+        interval = simpledialog.askinteger("Change Watcher", "Polling interval in milliseconds (0 disables):",
+                                           initialvalue=self.watch_interval, minvalue=0)
+        if interval is None:
+            return
+        self.watch_interval = interval
+        self.settings["watch_interval"] = interval
+        self.save_settings()
+        self.start_change_watcher()
+        self.set_status(f"Change watcher interval set to {interval} ms" if interval else "Change watcher disabled")
+
+    # --------------------- Settings & Performance Profiles --------------------- #
+    def load_settings(self):
+        try:
+            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+            return settings if isinstance(settings, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save_settings(self):
+        try:
+            os.makedirs(APP_DIR, exist_ok=True)
+            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.settings, f, indent=2)
+        except OSError as e:
+            self.log_operation(f"Failed to save settings: {e}", level="WARNING", operation="settings")
+
+    def activate_saved_profile(self):
+        profile = self.settings.get("profiles", {}).get(os.path.abspath(self.current_db))
+        if profile in PERFORMANCE_PROFILES:
+            try:
+                self.set_profile(profile, remember=False)
+            except sqlite3.Error as e:
+                self.log_operation(f"Failed to apply profile '{profile}': {e}", level="WARNING", operation="profile")
+
+    def set_profile(self, name, remember=True):
+        path = os.path.abspath(self.current_db)
+        if name in PERFORMANCE_PROFILES:
+            # The watcher connection keeps the WAL open, which blocks leaving WAL mode
+            watching = self.watch_conn is not None
+            self.stop_change_watcher()
+            try:
+                journal_mode = set_journal_mode(self.current_db, PERFORMANCE_PROFILES[name])
+            finally:
+                if watching:
+                    self.start_change_watcher()
+            ACTIVE_PROFILES[path] = name
+            self.log_operation(f"Performance profile '{name}' active (journal_mode={journal_mode})", operation="profile")
+        else:
+            ACTIVE_PROFILES.pop(path, None)
+        if remember:
+            profiles = self.settings.setdefault("profiles", {})
+            if name in PERFORMANCE_PROFILES:
+                profiles[path] = name
+            else:
+                profiles.pop(path, None)
+            self.save_settings()
+
+    def show_profile_dialog(self):
+        if not self.current_db:
+            messagebox.showwarning("Warning", "Please open a database first")
+            return
+        profile_win = tk.Toplevel(self.root)
+        profile_win.title(f"Performance Profile: {os.path.basename(self.current_db)}")
+        profile_var = tk.StringVar(value=ACTIVE_PROFILES.get(os.path.abspath(self.current_db), DEFAULT_PROFILE))
+        ttk.Radiobutton(profile_win, text=f"{DEFAULT_PROFILE} - no PRAGMAs applied", variable=profile_var,
+                        value=DEFAULT_PROFILE).pack(anchor="w", padx=10, pady=2)
+        for name, profile in PERFORMANCE_PROFILES.items():
+            details = ", ".join(f"{key}={value}" for key, value in profile.items())
+            ttk.Radiobutton(profile_win, text=f"{name} - {details}", variable=profile_var,
+                            value=name).pack(anchor="w", padx=10, pady=2)
+
+        def apply_profile():
+            try:
+                self.set_profile(profile_var.get())
+                self.set_status(f"Performance profile set to {profile_var.get()}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to apply profile: {str(e)}", parent=profile_win)
+
+        columns = ("profile", "scan", "sort", "write")
+        results_tree = ttk.Treeview(profile_win, columns=columns, show="headings", height=5)
+        for col, heading in zip(columns, ("Profile", "Scan", "Sort", f"Write ({BENCHMARK_WRITE_BATCHES} commits)")):
+            results_tree.heading(col, text=heading)
+            results_tree.column(col, width=130)
+        status_label = ttk.Label(profile_win, text="")
+
+        def run_benchmark():
+            benchmark_btn.config(state="disabled")
+            results_tree.delete(*results_tree.get_children())
+            status_label.config(text="Benchmarking...")
+            progress_queue = queue.Queue()
+            threading.Thread(target=run_profile_benchmark, args=(self.current_db, progress_queue),
+                             daemon=True).start()
+
+            def poll():
+                while True:
+                    try:
+                        message = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if message[0] == "table":
+                        status_label.config(text=f"Benchmarking on table '{message[1]}'...")
+                    elif message[0] == "result":
+                        name, timings = message[1], message[2]
+                        results_tree.insert("", tk.END, values=(name,) + tuple(f"{t * 1000:.1f} ms" for t in timings))
+                        self.log_operation(f"Benchmark {name}: " + ", ".join(f"{t * 1000:.1f} ms" for t in timings),
+                                           operation="profile_benchmark")
+                    else:
+                        benchmark_btn.config(state="normal")
+                        status_label.config(text="Benchmark finished" if message[0] == "finished"
+                                            else f"Benchmark failed: {message[1]}")
+                        return
+                profile_win.after(100, poll)
+
+            poll()
+
+        buttons = ttk.Frame(profile_win)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Apply", command=apply_profile).pack(side=tk.LEFT, padx=2)
+        benchmark_btn = ttk.Button(buttons, text="Benchmark Profiles", command=run_benchmark)
+        benchmark_btn.pack(side=tk.LEFT, padx=2)
+        results_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        status_label.pack(anchor="w", padx=10, pady=(0, 5))
 
     # --------------------- Status Helper --------------------- #
-    def set_status(self, message):
+    def set_status(self, message, **details):
         self.status_var.set(message)
-        self.log_operation(message)
+        self.log_operation(message, **details)
         self.root.after(3000, lambda: self.status_var.set("Ready"))
 
     # --------------------- Database & Table Functions --------------------- #
@@ -162,7 +1536,10 @@ class DataManager:
                 open(file_path, 'w').close()
                 self.current_db = file_path
                 self.db_path_label.config(text=file_path)
+                self.stop_change_watcher()
+                self.activate_saved_profile()
                 self.load_tables()
+                self.start_change_watcher()
                 messagebox.showinfo("Success", "New database created successfully")
                 self.set_status("New database created successfully")
             except Exception as e:
@@ -173,7 +1550,10 @@ class DataManager:
         if file_path:
             self.current_db = file_path
             self.db_path_label.config(text=file_path)
+            self.stop_change_watcher()
+            self.activate_saved_profile()
             self.load_tables()
+            self.start_change_watcher()
             self.set_status("Database opened")
 
     def backup_database(self):
@@ -190,6 +1570,7 @@ class DataManager:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to backup database: {str(e)}")
 
+    @traced("import_csv_to_table")
     def import_csv_to_table(self):
         if not self.current_table:
             messagebox.showwarning("Warning", "Please select a table to import data into")
@@ -198,38 +1579,263 @@ class DataManager:
                                                title="Select CSV File")
         if file_path:
             try:
-                conn = sqlite3.connect(self.current_db)
+                start = time.perf_counter()
+                conn = self.connect_db()
                 cursor = conn.cursor()
-                with open(file_path, "r", encoding="utf-8") as f:
+                row_count = 0
+                last_rowid = self.max_rowid(cursor)
+                with TRACER.span("file read + insert", path=file_path), open(file_path, "r", encoding="utf-8") as f:
                     reader = csv.reader(f)
                     headers = next(reader)  # assume first row is header
                     for row in reader:
                         placeholders = ", ".join(["?"] * len(row))
                         query = f"INSERT INTO {self.current_table} VALUES ({placeholders})"
                         cursor.execute(query, row)
+                        row_count += 1
+                new_rows = self.fetch_grid_rows(cursor, "rowid > ?", (last_rowid,))
                 conn.commit()
                 conn.close()
-                self.load_table_data(None)
+                duration = time.perf_counter() - start
+                if self.grid_has_rowid and len(new_rows) != row_count:
+                    self.load_table_data(None)  # Explicit keys below MAX(rowid) are missed by "rowid > ?"
+                else:
+                    self.apply_grid_changes(new_rows)
                 messagebox.showinfo("Success", f"Data imported from {file_path}")
-                self.set_status("CSV data imported")
+                self.set_status("CSV data imported", operation="import_csv", duration=duration, rows=row_count)
             except Exception as e:
+                self.log_operation(f"CSV import failed: {e}", level="ERROR", operation="import_csv")
                 messagebox.showerror("Error", f"Failed to import CSV: {str(e)}")
 
+    def import_csv_new_table_dialog(self):
+        if not self.current_db:
+            messagebox.showwarning("Warning", "Please create or open a database first")
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")], title="Select CSV File")
+        if not file_path:
+            return
+        try:
+            names, types = sample_csv(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read CSV: {str(e)}")
+            return
+
+        import_win = tk.Toplevel(self.root)
+        import_win.title("Import CSV as New Table")
+        ttk.Label(import_win, text="Table Name:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        table_entry = ttk.Entry(import_win)
+        table_entry.insert(0, re.sub(r"\W", "_", os.path.splitext(os.path.basename(file_path))[0]))
+        table_entry.grid(row=0, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        ttk.Label(import_win, text="Column").grid(row=1, column=0, padx=5)
+        ttk.Label(import_win, text="Inferred Type").grid(row=1, column=1, padx=5)
+        ttk.Label(import_win, text="Index").grid(row=1, column=2, padx=5)
+        type_boxes, index_vars = [], []
+        for i, (name, col_type) in enumerate(zip(names, types), start=2):
+            ttk.Label(import_win, text=name).grid(row=i, column=0, padx=5, pady=1, sticky="w")
+            type_box = ttk.Combobox(import_win, values=CSV_TYPES, state="readonly", width=10)
+            type_box.set(col_type)
+            type_box.grid(row=i, column=1, padx=5, pady=1)
+            index_var = tk.BooleanVar(value=False)
+            ttk.Checkbutton(import_win, variable=index_var).grid(row=i, column=2, padx=5, pady=1)
+            type_boxes.append(type_box)
+            index_vars.append(index_var)
+
+        row = len(names) + 2
+        ttk.Label(import_win, text="Primary Key:").grid(row=row, column=0, padx=5, pady=5, sticky="w")
+        pk_box = ttk.Combobox(import_win, values=["(none)"] + names, state="readonly")
+        pk_box.set("(none)")
+        pk_box.grid(row=row, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+        without_rowid_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(import_win, text="WITHOUT ROWID", variable=without_rowid_var).grid(
+            row=row + 1, column=0, padx=5, sticky="w")
+        strict_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(import_win, text="STRICT", variable=strict_var,
+                        state="normal" if STRICT_SUPPORTED else "disabled").grid(row=row + 1, column=1, padx=5, sticky="w")
+        progress = ttk.Progressbar(import_win, mode="determinate", maximum=1.0)
+        progress.grid(row=row + 2, column=0, columnspan=3, padx=5, pady=5, sticky="ew")
+        status_label = ttk.Label(import_win, text=f"Types inferred from the first {CSV_SAMPLE_ROWS} rows")
+        status_label.grid(row=row + 3, column=0, columnspan=3, padx=5, sticky="w")
+        import_btn = ttk.Button(import_win, text="Import")
+        import_btn.grid(row=row + 4, column=0, columnspan=3, pady=10)
+
+        def start_import():
+            table = table_entry.get().strip()
+            if not table:
+                messagebox.showwarning("Warning", "Please enter a table name", parent=import_win)
+                return
+            try:
+                exists = self.object_exists(table)
+            except sqlite3.Error as e:
+                messagebox.showerror("Error", f"Failed to check table name: {str(e)}", parent=import_win)
+                return
+            if exists:
+                messagebox.showwarning("Warning", f"'{table}' already exists in the database", parent=import_win)
+                return
+            primary_key = None if pk_box.get() == "(none)" else pk_box.get()
+            if without_rowid_var.get() and not primary_key:
+                messagebox.showwarning("Warning", "WITHOUT ROWID tables need a primary key", parent=import_win)
+                return
+            col_types = [box.get() for box in type_boxes]
+            create_sql = create_table_sql(table, names, col_types, primary_key,
+                                          without_rowid_var.get(), strict_var.get())
+            index_columns = [name for name, var in zip(names, index_vars) if var.get() and name != primary_key]
+            progress_queue = queue.Queue()
+            import_btn.config(state="disabled")
+            threading.Thread(target=import_csv_file, daemon=True,
+                             args=(self.current_db, file_path, table, names, col_types, create_sql,
+                                   index_columns, progress_queue)).start()
+
+            def poll():
+                while True:
+                    try:
+                        kind, value, rows = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "progress":
+                        progress.config(value=value)
+                        status_label.config(text=f"{rows} rows loaded")
+                    elif kind == "status":
+                        status_label.config(text=value)
+                    elif kind == "done":
+                        progress.config(value=1.0)
+                        status_label.config(text=f"{rows} rows imported in {value:.1f} s")
+                        self.load_tables()
+                        self.set_status("CSV imported as new table", operation="import_csv_new_table",
+                                        duration=value, rows=rows)
+                        return
+                    else:
+                        import_btn.config(state="normal")
+                        status_label.config(text="Import failed")
+                        messagebox.showerror("Error", f"Failed to import CSV: {value}", parent=import_win)
+                        return
+                import_win.after(100, poll)
+
+            poll()
+
+        import_btn.config(command=start_import)
+
+    @traced("load_tables")
     def load_tables(self):
+        self.tree_generation += 1
+        self.tree_page_after.clear()
         self.tables_tree.delete(*self.tables_tree.get_children())
         if self.current_db:
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = cursor.fetchall()
-                for table in tables:
-                    self.tables_tree.insert("", tk.END, text=table[0], values=table[0])
+                cursor.execute("SELECT type, COUNT(*) FROM sqlite_master GROUP BY type")
+                counts = dict(cursor.fetchall())
                 conn.close()
+                filtered = bool(self.tree_filter_var.get().strip())
+                for obj_type, label in OBJECT_GROUPS:
+                    group = self.tables_tree.insert("", tk.END, iid=f"grp:{obj_type}", tags=("group", obj_type),
+                                                    text=f"{label} ({counts.get(obj_type, 0)})")
+                    if counts.get(obj_type):
+                        # Placeholder child makes the group expandable; real children load on expand
+                        self.tables_tree.insert(group, tk.END, text="...", tags=("placeholder",))
+                # Tables open straight away; with a filter every group shows its matches
+                for obj_type, label in OBJECT_GROUPS:
+                    if counts.get(obj_type) and (obj_type == "table" or filtered):
+                        if self.load_object_page(obj_type) or obj_type == "table":
+                            self.tables_tree.item(f"grp:{obj_type}", open=True)
+                self.sync_change_watcher()
                 self.set_status("Tables loaded")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load tables: {str(e)}")
 
+    def load_object_page(self, obj_type):
+        # Inserts the next TREE_PAGE_SIZE objects of a type (matching the filter) under its group
+        group = f"grp:{obj_type}"
+        for child in self.tables_tree.get_children(group):
+            if {"placeholder", "more"} & set(self.tables_tree.item(child, "tags")):
+                self.tables_tree.delete(child)
+        sql = "SELECT name FROM sqlite_master WHERE type = ?"
+        params = [obj_type]
+        term = self.tree_filter_var.get().strip()
+        if term:
+            sql += " AND name LIKE ? ESCAPE '\\'"
+            params.append(like_pattern(term))
+        if obj_type in self.tree_page_after:
+            sql += " AND name > ?"
+            params.append(self.tree_page_after[obj_type])
+        sql += " ORDER BY name LIMIT ?"
+        params.append(TREE_PAGE_SIZE + 1)
+        conn = self.connect_db()
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        names = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        has_more = len(names) > TREE_PAGE_SIZE
+        names = names[:TREE_PAGE_SIZE]
+        with TRACER.span("tree insert", rows=len(names)):
+            for name in names:
+                if not self.tables_tree.exists(f"obj:{name}"):
+                    self.tables_tree.insert(group, tk.END, iid=f"obj:{name}", text=name, tags=(obj_type,))
+        if names:
+            self.tree_page_after[obj_type] = names[-1]
+        if has_more:
+            self.tables_tree.insert(group, tk.END, iid=f"more:{obj_type}", text="Load more...", tags=("more", obj_type))
+        if obj_type == "table" and names:
+            self.start_table_stats(names)
+        return len(names)
+
+    def expand_object_group(self, event):
+        item = self.tables_tree.focus()
+        tags = self.tables_tree.item(item, "tags") if item else ()
+        if "group" in tags:
+            children = self.tables_tree.get_children(item)
+            if children and "placeholder" in self.tables_tree.item(children[0], "tags"):
+                try:
+                    self.load_object_page(tags[1])
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to load objects: {str(e)}")
+
+    def selected_object(self, item):
+        # Returns (type, name) for object items, (None, None) for groups and helper rows
+        if not item.startswith("obj:"):
+            return None, None
+        return self.tables_tree.item(item, "tags")[0], item[4:]
+
+    def object_exists(self, name):
+        conn = self.connect_db()
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+        conn.close()
+        return exists
+
+    def schedule_tree_filter(self, event=None):
+        if self.tree_filter_job is not None:
+            self.root.after_cancel(self.tree_filter_job)
+        self.tree_filter_job = self.root.after(TREE_FILTER_DELAY_MS, self.apply_tree_filter)
+
+    def apply_tree_filter(self):
+        self.tree_filter_job = None
+        self.load_tables()
+
+    def start_table_stats(self, names):
+        # Row counts and sizes fill in from a worker so large schemas open instantly
+        generation = self.tree_generation
+        thread = threading.Thread(target=collect_table_stats, daemon=True,
+                                  args=(self.current_db, names, generation,
+                                        lambda gen: gen == self.tree_generation, self.tree_stats_queue))
+        thread.start()
+        self.tree_stats_threads.append(thread)
+        if len(self.tree_stats_threads) == 1:
+            self.root.after(200, self.poll_table_stats)
+
+    def poll_table_stats(self):
+        while True:
+            try:
+                generation, name, count, size = self.tree_stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            iid = f"obj:{name}"
+            if generation == self.tree_generation and self.tables_tree.exists(iid):
+                self.tables_tree.set(iid, "rows", "?" if count is None else count)
+                self.tables_tree.set(iid, "size", format_size(size))
+        self.tree_stats_threads = [thread for thread in self.tree_stats_threads if thread.is_alive()]
+        if self.tree_stats_threads or not self.tree_stats_queue.empty():
+            self.root.after(200, self.poll_table_stats)
+
     def create_table_dialog(self):
         if not self.current_db:
             messagebox.showwarning("Warning", "Please create or open a database first")
@@ -283,7 +1889,7 @@ class DataManager:
             return
 
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             query = f"CREATE TABLE {table_name} ({', '.join(columns)})"
             cursor.execute(query)
@@ -298,13 +1904,13 @@ class DataManager:
 
     def delete_table(self):
         selected = self.tables_tree.selection()
-        if not selected:
+        obj_type, table_name = self.selected_object(selected[0]) if selected else (None, None)
+        if obj_type != "table":
             messagebox.showwarning("Warning", "Please select a table to delete")
             return
-        table_name = self.tables_tree.item(selected[0], "text")
         if messagebox.askyesno("Confirm", f"Delete table '{table_name}'?"):
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute(f"DROP TABLE {table_name}")
                 conn.commit()
@@ -315,14 +1921,32 @@ class DataManager:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete table: {str(e)}")
 
+    @traced("load_table_data")
     def load_table_data(self, event):
-        selected = self.tables_tree.selection()
-        if not selected:
+        # Selection events pick the object to show; direct calls (event=None) reload the current table
+        table = self.current_table
+        if event is not None:
+            selected = self.tables_tree.selection()
+            if not selected:
+                return
+            tags = self.tables_tree.item(selected[0], "tags")
+            if "more" in tags:
+                self.load_object_page(tags[1])
+                return
+            obj_type, table = self.selected_object(selected[0])
+            if obj_type not in ("table", "view"):
+                return
+        if not table:
             return
-        self.current_table = self.tables_tree.item(selected[0], "text")
+        if self.has_pending_changes():
+            if not messagebox.askyesno("Pending Changes", "Discard pending batch changes and reload?"):
+                return
+            self.clear_pending_changes()
+        self.current_table = table
         self.data_tree.delete(*self.data_tree.get_children())
         try:
-            conn = sqlite3.connect(self.current_db)
+            start = time.perf_counter()
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute(f"PRAGMA table_info({self.current_table})")
             columns_info = cursor.fetchall()
@@ -332,13 +1956,31 @@ class DataManager:
             for col in columns:
                 self.data_tree.heading(col, text=col)
                 self.data_tree.column(col, width=100)
-            cursor.execute(f"SELECT * FROM {self.current_table}")
-            self.all_rows = cursor.fetchall()  # Store rows for searching/filtering
-            for row in self.all_rows:
-                self.data_tree.insert("", tk.END, values=row)
+            # Key grid items by rowid so later edits can patch single rows instead of reloading
+            self.grid_has_rowid = ("rowid" not in (col.lower() for col in columns)
+                                   and table_has_rowid(cursor, self.current_table))
+            if self.batch_mode.get() and not self.grid_has_rowid:
+                # Batch edits are keyed by rowid; leave batch mode for views and WITHOUT ROWID tables
+                self.batch_mode.set(False)
+                self.batch_controls.pack_forget()
+                self.log_operation(f"Batch mode turned off: {self.current_table} has no rowids",
+                                   operation="batch_edit")
+            self.grid_select = ", ".join(grid_column_expr(col) for col in columns)
+            if self.grid_has_rowid:
+                cursor.execute(f"SELECT rowid, {self.grid_select} FROM {self.current_table}")
+                self.all_rows = {str(row[0]): row[1:] for row in cursor.fetchall()}
+            else:
+                cursor.execute(f"SELECT {self.grid_select} FROM {self.current_table}")
+                self.all_rows = {f"row{i}": row for i, row in enumerate(cursor.fetchall())}
+            with TRACER.span("tree insert", rows=len(self.all_rows)):
+                for iid, row in self.all_rows.items():
+                    self.data_tree.insert("", tk.END, iid=iid, values=row)
             conn.close()
-            self.set_status("Table data loaded")
+            self.sync_change_watcher()
+            self.set_status("Table data loaded", operation="load_table_data",
+                            duration=time.perf_counter() - start, rows=len(self.all_rows))
         except Exception as e:
+            self.log_operation(f"Loading {self.current_table} failed: {e}", level="ERROR", operation="load_table_data")
             messagebox.showerror("Error", f"Failed to load table data: {str(e)}")
 
     # --------------------- Data Row Operations --------------------- #
@@ -349,7 +1991,7 @@ class DataManager:
         self.data_dialog = tk.Toplevel(self.root)
         self.data_dialog.title("Add Data")
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute(f"PRAGMA table_info({self.current_table})")
             columns = cursor.fetchall()
@@ -364,9 +2006,10 @@ class DataManager:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load columns: {str(e)}")
 
+    @traced("add_data")
     def add_data(self):
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             columns = []
             values = []
@@ -381,10 +2024,13 @@ class DataManager:
                 values.append(entry.get())
             query = f"INSERT INTO {self.current_table} ({', '.join(columns)}) VALUES ({', '.join(['?']*len(values))})"
             cursor.execute(query, values)
+            rowid = cursor.lastrowid
+            new_rows = self.fetch_grid_rows(cursor, "rowid = ?", (rowid,))
             conn.commit()
             conn.close()
-            self.last_operation = {"action": "add", "data": values, "columns": columns}
-            self.load_table_data(None)
+            self.last_operation = {"action": "add", "data": values, "columns": columns,
+                                   "rowid": rowid if self.grid_has_rowid else None}
+            self.apply_grid_changes(new_rows)
             self.data_dialog.destroy()
             messagebox.showinfo("Success", "Data added successfully")
             self.set_status("Data added successfully")
@@ -399,17 +2045,22 @@ class DataManager:
         self.edit_data_window = tk.Toplevel(self.root)
         self.edit_data_window.title("Edit Data")
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute(f"PRAGMA table_info({self.current_table})")
             columns = [col[1] for col in cursor.fetchall()]
             values = self.data_tree.item(selected[0], "values")
+            large = self.large_value_columns(selected[0])
             self.edit_entries = []
             for i, (col, val) in enumerate(zip(columns, values)):
                 ttk.Label(self.edit_data_window, text=col).grid(row=i, column=0, padx=5, pady=2)
                 entry = ttk.Entry(self.edit_data_window)
                 entry.insert(0, val)
                 entry.grid(row=i, column=1, padx=5, pady=2)
+                if col in large:
+                    # Placeholders must never be written back; large values are edited from Row Details
+                    entry.configure(state="disabled")
+                    continue
                 self.edit_entries.append(entry)
             ttk.Button(self.edit_data_window, text="Update",
                        command=lambda: self.update_data(selected[0])).grid(row=len(columns), column=0, columnspan=2, pady=10)
@@ -417,9 +2068,10 @@ class DataManager:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
 
+    @traced("update_data")
     def update_data(self, item_id):
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             columns = []
             for entry in self.edit_entries:
@@ -428,21 +2080,32 @@ class DataManager:
                 if label_widgets:
                     columns.append(label_widgets[0]["text"])
             values = [entry.get() for entry in self.edit_entries]
-            primary_key = self.get_primary_key()
-            pk_value = self.data_tree.item(item_id, "values")[0]
+            if self.grid_has_rowid:
+                primary_key, pk_value = "rowid", item_id
+            else:
+                primary_key = self.get_primary_key()
+                pk_value = self.data_tree.item(item_id, "values")[0]
             set_clause = ", ".join([f"{col} = ?" for col in columns])
             query = f"UPDATE {self.current_table} SET {set_clause} WHERE {primary_key} = ?"
             cursor.execute(query, values + [pk_value])
+            new_rows = self.fetch_grid_rows(cursor, "rowid = ?", (item_id,))
             conn.commit()
             conn.close()
-            self.last_operation = {"action": "edit", "old": self.data_tree.item(item_id, "values"), "new": values, "columns": columns, "pk": pk_value}
-            self.load_table_data(None)
+            grid_columns = list(self.data_tree["columns"])
+            old_values = self.data_tree.item(item_id, "values")
+            self.last_operation = {"action": "edit", "old": [old_values[grid_columns.index(col)] for col in columns],
+                                   "new": values, "columns": columns, "pk": pk_value, "pk_column": primary_key}
+            if new_rows:
+                self.apply_grid_changes(new_rows)
+            else:
+                self.load_table_data(None)  # Row not found by rowid (e.g. its INTEGER PRIMARY KEY changed)
             self.edit_data_window.destroy()
             messagebox.showinfo("Success", "Data updated successfully")
             self.set_status("Data updated successfully")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update data: {str(e)}")
 
+    @traced("delete_data")
     def delete_data(self):
         selected = self.data_tree.selection()
         if not selected:
@@ -450,26 +2113,86 @@ class DataManager:
             return
         if messagebox.askyesno("Confirm", "Delete selected record(s)?"):
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
-                primary_key = self.get_primary_key()
+                primary_key = "rowid" if self.grid_has_rowid else self.get_primary_key()
                 deleted_rows = []
                 for item in selected:
-                    value = self.data_tree.item(item, "values")[0]
-                    deleted_rows.append(self.data_tree.item(item, "values"))
+                    value = item if self.grid_has_rowid else self.data_tree.item(item, "values")[0]
+                    # Grid values may be placeholders, so keep the stored row for undo
+                    cursor.execute(f"SELECT * FROM {self.current_table} WHERE {primary_key} = ?", (value,))
+                    deleted_rows.append(cursor.fetchone())
                     cursor.execute(f"DELETE FROM {self.current_table} WHERE {primary_key} = ?", (value,))
                 conn.commit()
                 conn.close()
                 self.last_operation = {"action": "delete", "rows": deleted_rows, "pk": primary_key}
-                self.load_table_data(None)
+                self.apply_grid_changes(removed=selected)
                 messagebox.showinfo("Success", "Data deleted successfully")
                 self.set_status("Data deleted successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete data: {str(e)}")
 
+    # --------------------- Grid Patching Helpers --------------------- #
+    def max_rowid(self, cursor):
+        if not self.grid_has_rowid:
+            return None
+        cursor.execute(f"SELECT MAX(rowid) FROM {self.current_table}")
+        return cursor.fetchone()[0] or 0
+
+    def fetch_grid_rows(self, cursor, where, params=()):
+        # Fetches (rowid, *values) for the changed rows only; grids without rowids get a full reload instead
+        if not self.grid_has_rowid:
+            return []
+        cursor.execute(f"SELECT rowid, {self.grid_select} FROM {self.current_table} WHERE {where}", params)
+        return cursor.fetchall()
+
+    def large_value_columns(self, item_id):
+        # Returns {column: (type, length)} for the row's values that the grid only shows as placeholders
+        if not self.grid_has_rowid:
+            # No rowid to look the row up by, so read the placeholders back from the grid itself
+            values = self.data_tree.item(item_id, "values")
+            placeholders = {col: grid_placeholder(value) for col, value in zip(self.data_tree["columns"], values)}
+            return {col: info for col, info in placeholders.items() if info}
+        columns = list(self.data_tree["columns"])
+        conn = self.connect_db()
+        cursor = conn.cursor()
+        checks = ", ".join(f"typeof({quote_ident(col)}), length({quote_ident(col)})" for col in columns)
+        cursor.execute(f"SELECT {checks} FROM {self.current_table} WHERE rowid = ?", (item_id,))
+        row = cursor.fetchone() or ()
+        conn.close()
+        large = {}
+        for i, col in enumerate(columns):
+            value_type, length = row[2 * i:2 * i + 2] or (None, None)
+            if value_type == "blob" or (value_type == "text" and length > GRID_TEXT_LIMIT):
+                large[col] = (value_type, length)
+        return large
+
+    def row_matches_filter(self, row, search_term):
+        return not search_term or any(search_term in str(cell).lower() for cell in row)
+
+    def apply_grid_changes(self, rows=(), removed=()):
+        # Patches data_tree in place so scroll position and selection survive the change
+        if not self.grid_has_rowid:
+            self.load_table_data(None)
+            return
+        search_term = self.search_var.get().lower()
+        with TRACER.span("tree patch", rows=len(rows), removed=len(removed)):
+            for iid in removed:
+                self.all_rows.pop(iid, None)
+                if self.data_tree.exists(iid):
+                    self.data_tree.delete(iid)
+            for row in rows:
+                iid, values = str(row[0]), row[1:]
+                self.all_rows[iid] = values
+                if self.data_tree.exists(iid):
+                    self.data_tree.item(iid, values=values)
+                elif self.row_matches_filter(values, search_term):
+                    self.data_tree.insert("", tk.END, iid=iid, values=values)
+        self.sync_change_watcher()
+
     def get_primary_key(self):
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute(f"PRAGMA table_info({self.current_table})")
             for col in cursor.fetchall():
@@ -481,13 +2204,196 @@ class DataManager:
         except Exception as e:
             return "rowid"
 
+    # --------------------- Batch Editing --------------------- #
+    def has_pending_changes(self):
+        return bool(self.pending_updates or self.pending_inserts or self.pending_deletes)
+
+    def update_pending_label(self):
+        count = len(self.pending_updates) + len(self.pending_inserts) + len(self.pending_deletes)
+        self.pending_label.config(text=f"{count} pending row change(s)" if count else "No pending changes")
+
+    def toggle_batch_mode(self):
+        if self.batch_mode.get():
+            if not self.current_table or not self.grid_has_rowid:
+                messagebox.showwarning("Warning", "Batch editing needs a selected table with rowids")
+                self.batch_mode.set(False)
+                return
+            self.batch_controls.pack(pady=(0, 5), after=self.data_controls)
+            self.update_pending_label()
+            return
+        if self.has_pending_changes():
+            answer = messagebox.askyesnocancel("Pending Changes", "Apply pending changes before leaving batch mode?")
+            if answer is None:
+                self.batch_mode.set(True)
+                return
+            if answer:
+                self.apply_pending_changes()
+                if self.has_pending_changes():
+                    self.batch_mode.set(True)  # Apply failed, keep the edits
+                    return
+            else:
+                self.discard_pending_changes()
+        self.batch_controls.pack_forget()
+
+    def start_cell_edit(self, event):
+        iid = self.data_tree.identify_row(event.y)
+        column = self.data_tree.identify_column(event.x)
+        if not iid or column in ("", "#0") or iid in self.pending_deletes:
+            return
+        col_name = self.data_tree["columns"][int(column[1:]) - 1]
+        if iid not in self.pending_inserts and col_name in self.large_value_columns(iid):
+            messagebox.showwarning("Warning", "Large values are edited from Row Details")
+            return
+        bbox = self.data_tree.bbox(iid, column)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        editor = ttk.Entry(self.data_tree)
+        editor.insert(0, self.data_tree.set(iid, col_name))
+        editor.select_range(0, tk.END)
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        state = {"done": False}
+
+        def finish(save):
+            if state["done"]:
+                return
+            state["done"] = True
+            if save:
+                self.set_pending_value(iid, col_name, editor.get())
+            editor.destroy()
+
+        editor.bind("<Return>", lambda e: finish(True))
+        editor.bind("<FocusOut>", lambda e: finish(True))
+        editor.bind("<Escape>", lambda e: finish(False))
+
+    def set_pending_value(self, iid, column, value):
+        if self.data_tree.set(iid, column) == value:
+            return
+        self.data_tree.set(iid, column, value)
+        if iid in self.pending_inserts:
+            self.pending_inserts[iid][column] = value
+        else:
+            self.pending_updates.setdefault(iid, {})[column] = value
+            self.data_tree.item(iid, tags=("dirty",))
+        self.update_pending_label()
+
+    def batch_add_row(self):
+        self.pending_counter += 1
+        iid = f"new{self.pending_counter}"
+        columns = self.data_tree["columns"]
+        self.data_tree.insert("", tk.END, iid=iid, values=[""] * len(columns), tags=("inserted",))
+        self.pending_inserts[iid] = {}
+        self.data_tree.see(iid)
+        self.data_tree.selection_set(iid)
+        self.update_pending_label()
+
+    def batch_mark_delete(self):
+        for iid in self.data_tree.selection():
+            if iid in self.pending_inserts:
+                del self.pending_inserts[iid]
+                self.data_tree.delete(iid)
+            elif iid in self.pending_deletes:
+                self.pending_deletes.discard(iid)  # Toggle the mark off again
+                self.data_tree.item(iid, tags=("dirty",) if iid in self.pending_updates else ())
+            else:
+                self.pending_deletes.add(iid)
+                self.data_tree.item(iid, tags=("deleted",))
+        self.update_pending_label()
+
+    def clear_pending_changes(self):
+        self.pending_updates.clear()
+        self.pending_inserts.clear()
+        self.pending_deletes.clear()
+        self.update_pending_label()
+
+    def discard_pending_changes(self):
+        for iid in self.pending_inserts:
+            if self.data_tree.exists(iid):
+                self.data_tree.delete(iid)
+        for iid in set(self.pending_updates) | self.pending_deletes:
+            if self.data_tree.exists(iid):
+                self.data_tree.item(iid, values=self.all_rows.get(iid, ()), tags=())
+        self.clear_pending_changes()
+        self.set_status("Pending changes discarded")
+
+    @traced("apply_pending_changes")
+    def apply_pending_changes(self):
+        if not self.has_pending_changes():
+            return
+        table = self.current_table
+        try:
+            start = time.perf_counter()
+            conn = self.connect_db()
+            cursor = conn.cursor()
+            last_rowid = self.max_rowid(cursor)
+            # All statements share one implicit transaction: one commit, one fsync
+            deletes = sorted(self.pending_deletes)
+            cursor.executemany(f"DELETE FROM {table} WHERE rowid = ?", [(iid,) for iid in deletes])
+
+            # Group rows by their changed column set so each group is one prepared executemany()
+            update_groups = {}
+            for iid, changes in self.pending_updates.items():
+                if iid not in self.pending_deletes:
+                    columns = tuple(sorted(changes))
+                    update_groups.setdefault(columns, []).append([changes[col] for col in columns] + [iid])
+            for columns, params in update_groups.items():
+                set_clause = ", ".join(f"{quote_ident(col)} = ?" for col in columns)
+                cursor.executemany(f"UPDATE {table} SET {set_clause} WHERE rowid = ?", params)
+
+            insert_groups = {}
+            for values in self.pending_inserts.values():
+                columns = tuple(sorted(values))
+                insert_groups.setdefault(columns, []).append([values[col] for col in columns])
+            for columns, params in insert_groups.items():
+                if columns:
+                    cursor.executemany(f"INSERT INTO {table} ({', '.join(quote_ident(col) for col in columns)}) "
+                                       f"VALUES ({', '.join(['?'] * len(columns))})", params)
+                else:
+                    for _ in params:
+                        cursor.execute(f"INSERT INTO {table} DEFAULT VALUES")
+
+            updated = [iid for iid in self.pending_updates if iid not in self.pending_deletes]
+            changed_rows = []
+            for i in range(0, len(updated), BATCH_FETCH_ROWS):
+                chunk = updated[i:i + BATCH_FETCH_ROWS]
+                changed_rows += self.fetch_grid_rows(cursor, f"rowid IN ({', '.join(['?'] * len(chunk))})", chunk)
+            # An edited INTEGER PRIMARY KEY moves the row to a new rowid, and an explicit key below
+            # MAX(rowid) places a new row where "rowid > ?" cannot find it; only a reload shows those
+            inserted_rows = self.fetch_grid_rows(cursor, "rowid > ?", (last_rowid,))
+            rowids_moved = len(changed_rows) < len(updated) or len(inserted_rows) < len(self.pending_inserts)
+            changed_rows += inserted_rows
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to apply changes (nothing was saved): {str(e)}")
+            return
+
+        change_count = len(deletes) + len(updated) + len(self.pending_inserts)
+        for iid in self.pending_inserts:
+            if self.data_tree.exists(iid):
+                self.data_tree.delete(iid)
+        self.clear_pending_changes()
+        if rowids_moved:
+            self.load_table_data(None)
+        else:
+            self.apply_grid_changes(changed_rows, removed=deletes)
+        for row in changed_rows:
+            if self.data_tree.exists(str(row[0])):
+                self.data_tree.item(str(row[0]), tags=())
+        self.last_operation = None  # Batch changes are not undoable row by row
+        self.set_status(f"Applied {change_count} row change(s)", operation="apply_pending_changes",
+                        duration=time.perf_counter() - start, rows=change_count)
+
     # --------------------- Right-Click Context Menus & Row Details --------------------- #
     def show_table_sidebar(self, event):
         row_id = self.tables_tree.identify_row(event.y)
         if not row_id:
             return
+        obj_type, table_name = self.selected_object(row_id)
+        if obj_type != "table":
+            return
         self.tables_tree.selection_set(row_id)
-        table_name = self.tables_tree.item(row_id, "text")
         if self.sidebar is not None and self.sidebar.winfo_exists():
             self.sidebar.destroy()
         self.sidebar = tk.Toplevel(self.root)
@@ -496,12 +2402,13 @@ class DataManager:
         self.sidebar.attributes("-topmost", True)
         ttk.Button(self.sidebar, text="Edit Table Name", command=lambda: self.edit_table_name(table_name)).pack(fill=tk.X, padx=10, pady=5)
         ttk.Button(self.sidebar, text="View Table Schema", command=lambda: self.edit_table_schema(table_name)).pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(self.sidebar, text="Manage Indexes", command=lambda: self.show_index_manager(table_name)).pack(fill=tk.X, padx=10, pady=5)
         ttk.Button(self.sidebar, text="Delete Table", command=lambda: self.delete_table_by_sidebar(table_name)).pack(fill=tk.X, padx=10, pady=5)
 
     def delete_table_by_sidebar(self, table_name):
         if messagebox.askyesno("Confirm", f"Delete table '{table_name}'?"):
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute(f"DROP TABLE {table_name}")
                 conn.commit()
@@ -518,7 +2425,7 @@ class DataManager:
         new_name = simpledialog.askstring("Edit Table Name", f"Enter new name for table '{old_name}':")
         if new_name and new_name.strip():
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute(f"ALTER TABLE {old_name} RENAME TO {new_name.strip()}")
                 conn.commit()
@@ -533,7 +2440,7 @@ class DataManager:
 
     def edit_table_schema(self, table_name):
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute(f"PRAGMA table_info({table_name})")
             schema_info = cursor.fetchall()
@@ -552,6 +2459,198 @@ class DataManager:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to retrieve schema: {str(e)}")
 
+    # --------------------- Index Manager --------------------- #
+    def show_index_manager(self, table_name):
+        if self.sidebar is not None and self.sidebar.winfo_exists():
+            self.sidebar.destroy()
+        index_win = tk.Toplevel(self.root)
+        index_win.title(f"Indexes of {table_name}")
+
+        columns = ("name", "columns", "unique", "origin", "where", "size", "used")
+        index_tree = ttk.Treeview(index_win, columns=columns, show="headings", height=10, selectmode="browse")
+        for col, heading, width in zip(columns, ("Name", "Columns", "Unique", "Origin", "Partial WHERE", "Size",
+                                                  "Used by Queries"), (160, 160, 60, 120, 160, 80, 100)):
+            index_tree.heading(col, text=heading)
+            index_tree.column(col, width=width)
+        index_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        ttk.Label(index_win, text="Recent queries using the selected index:").pack(anchor="w", padx=5)
+        queries_text = scrolledtext.ScrolledText(index_win, width=90, height=6)
+        queries_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        queries_text.configure(state="disabled")
+        state = {"usage": {}}
+
+        def show_queries(event=None):
+            selected = index_tree.selection()
+            queries = state["usage"].get(selected[0], []) if selected else []
+            queries_text.configure(state="normal")
+            queries_text.delete("1.0", tk.END)
+            queries_text.insert(tk.END, "\n\n".join(queries) if queries else "(none)")
+            queries_text.configure(state="disabled")
+
+        def refresh():
+            index_tree.delete(*index_tree.get_children())
+            try:
+                conn = self.connect_db()
+                indexes = table_indexes(conn.cursor(), table_name)
+                conn.close()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to list indexes: {str(e)}", parent=index_win)
+                return
+            for index in indexes:
+                index_tree.insert("", tk.END, iid=index["name"], values=(
+                    index["name"], ", ".join(index["columns"]), "yes" if index["unique"] else "no",
+                    index["origin"], index["where"], "...", "..."))
+            # Sizes and query usage can be slow on large databases, so they fill in from a worker
+            progress_queue = queue.Queue()
+            threading.Thread(target=index_usage_report, daemon=True,
+                             args=(self.current_db, [index["name"] for index in indexes],
+                                   self.query_history[-INDEX_HISTORY_QUERIES:], progress_queue)).start()
+
+            def poll():
+                while True:
+                    try:
+                        message = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if message[0] == "finished":
+                        return
+                    if message[0] == "error":
+                        for name in index_tree.get_children():
+                            for col in ("used", "size"):
+                                if index_tree.set(name, col) == "...":
+                                    index_tree.set(name, col, "?")
+                        self.log_operation(f"Index usage report failed: {message[1]}", level="WARNING",
+                                           operation="index_manager")
+                    elif message[0] == "usage":
+                        state["usage"] = message[1]
+                        for name, queries in message[1].items():
+                            if index_tree.exists(name):
+                                index_tree.set(name, "used", len(queries))
+                        show_queries()
+                    elif index_tree.exists(message[1]):
+                        index_tree.set(message[1], "size", format_size(message[2]))
+                if index_win.winfo_exists():
+                    index_win.after(100, poll)
+
+            poll()
+
+        def drop_index():
+            selected = index_tree.selection()
+            if not selected:
+                messagebox.showwarning("Warning", "Please select an index to drop", parent=index_win)
+                return
+            name = selected[0]
+            if name.startswith("sqlite_autoindex_"):
+                messagebox.showwarning("Warning", "Indexes created by UNIQUE or PRIMARY KEY constraints cannot be dropped",
+                                       parent=index_win)
+                return
+            used = len(state["usage"].get(name, []))
+            if messagebox.askyesno("Confirm", f"Drop index '{name}'? It is used by {used} recent queries.",
+                                   parent=index_win):
+                try:
+                    conn = self.connect_db()
+                    conn.execute(f"DROP INDEX {quote_ident(name)}")
+                    conn.commit()
+                    conn.close()
+                    self.set_status(f"Index {name} dropped", operation="drop_index")
+                    refresh()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to drop index: {str(e)}", parent=index_win)
+
+        buttons = ttk.Frame(index_win)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Create Index", command=lambda: self.create_index_dialog(
+            table_name, lambda: index_win.winfo_exists() and refresh())).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="Drop Index", command=drop_index).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=2)
+        index_tree.bind("<<TreeviewSelect>>", show_queries)
+        refresh()
+
+    def create_index_dialog(self, table_name, on_created):
+        try:
+            conn = self.connect_db()
+            cursor = conn.cursor()
+            cursor.execute(f"PRAGMA table_info({quote_ident(table_name)})")
+            table_columns = [col[1] for col in cursor.fetchall()]
+            conn.close()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load columns: {str(e)}")
+            return
+
+        create_win = tk.Toplevel(self.root)
+        create_win.title(f"Create Index on {table_name}")
+        ttk.Label(create_win, text="Index Name:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        name_entry = ttk.Entry(create_win, width=40)
+        name_entry.insert(0, f"idx_{table_name}_")
+        name_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Label(create_win, text="Columns:").grid(row=1, column=0, padx=5, pady=5, sticky="nw")
+        columns_list = tk.Listbox(create_win, selectmode=tk.MULTIPLE, height=min(10, max(3, len(table_columns))),
+                                  exportselection=False)
+        for col in table_columns:
+            columns_list.insert(tk.END, col)
+        columns_list.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+        unique_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(create_win, text="UNIQUE", variable=unique_var).grid(row=2, column=1, padx=5, sticky="w")
+        ttk.Label(create_win, text="Partial WHERE:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        where_entry = ttk.Entry(create_win, width=40)
+        where_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        progress = ttk.Progressbar(create_win, mode="indeterminate")
+        progress.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        status_label = ttk.Label(create_win, text="")
+        status_label.grid(row=5, column=0, columnspan=2, padx=5, sticky="w")
+        buttons = ttk.Frame(create_win)
+        buttons.grid(row=6, column=0, columnspan=2, pady=5)
+        create_btn = ttk.Button(buttons, text="Create")
+        create_btn.pack(side=tk.LEFT, padx=2)
+        cancel_btn = ttk.Button(buttons, text="Cancel Build", state="disabled")
+        cancel_btn.pack(side=tk.LEFT, padx=2)
+
+        def start_build():
+            name = name_entry.get().strip()
+            selected = [table_columns[i] for i in columns_list.curselection()]
+            if not name or not selected:
+                messagebox.showwarning("Warning", "Please enter an index name and select columns", parent=create_win)
+                return
+            create_sql = (f"CREATE {'UNIQUE ' if unique_var.get() else ''}INDEX {quote_ident(name)} "
+                          f"ON {quote_ident(table_name)} ({', '.join(quote_ident(col) for col in selected)})")
+            if where_entry.get().strip():
+                create_sql += f" WHERE {where_entry.get().strip()}"
+            conn_holder = []
+            progress_queue = queue.Queue()
+            create_btn.config(state="disabled")
+            # Connection.interrupt() is safe to call from another thread and aborts the CREATE INDEX
+            cancel_btn.config(state="normal", command=lambda: conn_holder and conn_holder[0].interrupt())
+            progress.start(10)
+            threading.Thread(target=build_index, daemon=True,
+                             args=(self.current_db, create_sql, conn_holder, progress_queue)).start()
+
+            def poll():
+                while True:
+                    try:
+                        kind, message, elapsed = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "progress":
+                        status_label.config(text=f"Building... {message:,} VM steps, {elapsed:.1f} s")
+                        continue
+                    progress.stop()
+                    cancel_btn.config(state="disabled")
+                    if kind == "done":
+                        self.set_status(f"Index {name} created", operation="create_index", duration=elapsed)
+                        create_win.destroy()
+                        on_created()
+                    else:
+                        create_btn.config(state="normal")
+                        status_label.config(text=f"Build stopped after {elapsed:.1f} s")
+                        messagebox.showerror("Error", f"Failed to create index: {message}", parent=create_win)
+                    return
+                create_win.after(100, poll)
+
+            poll()
+
+        create_btn.config(command=start_build)
+
     def show_data_context_menu(self, event):
         row_id = self.data_tree.identify_row(event.y)
         if not row_id:
@@ -566,6 +2665,10 @@ class DataManager:
         self.data_context_menu.post(event.x_root, event.y_root)
 
     def show_row_details(self, event):
+        # In batch mode double-click edits the cell in place instead
+        if self.batch_mode.get():
+            self.start_cell_edit(event)
+            return
         # On double-click, show details of the selected row
         row_id = self.data_tree.identify_row(event.y)
         if not row_id:
@@ -578,8 +2681,131 @@ class DataManager:
         detail_text = "\n".join(str(val) for val in row_values)
         text.insert(tk.END, detail_text)
         text.configure(state="disabled")
+        try:
+            large = self.large_value_columns(row_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read row: {str(e)}")
+            return
+        # Large values are opened lazily through incremental BLOB I/O
+        for col, (value_type, length) in large.items():
+            frame = ttk.Frame(detail_win)
+            frame.pack(fill=tk.X, padx=5, pady=2)
+            unit = "bytes" if value_type == "blob" else "chars"
+            ttk.Label(frame, text=f"{col}: {value_type.upper()} ({length} {unit})").pack(side=tk.LEFT)
+            if not self.grid_has_rowid:
+                continue  # Incremental BLOB I/O needs a rowid
+            ttk.Button(frame, text="Import...", command=lambda c=col: self.import_blob_from_file(c, row_id)).pack(side=tk.RIGHT, padx=2)
+            ttk.Button(frame, text="Export...", command=lambda c=col: self.export_blob_to_file(c, row_id)).pack(side=tk.RIGHT, padx=2)
+            ttk.Button(frame, text="View", command=lambda c=col: self.open_blob_viewer(c, row_id)).pack(side=tk.RIGHT, padx=2)
+
+    # --------------------- Incremental BLOB I/O --------------------- #
+    def open_blob_viewer(self, column, rowid):
+        try:
+            conn = self.connect_db()
+            blob = conn.blobopen(self.current_table, column, int(rowid), readonly=True)
+            size = len(blob)
+            kind = sniff_blob_type(blob.read(16))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open value: {str(e)}")
+            return
+        viewer = tk.Toplevel(self.root)
+        viewer.title(f"{self.current_table}.{column} (rowid {rowid})")
+        info_label = ttk.Label(viewer, text=f"{size} bytes, {kind}")
+        info_label.pack(anchor="w", padx=5, pady=5)
+        mode_var = tk.StringVar(value="text" if kind == "text" else "hex")
+        view_text = scrolledtext.ScrolledText(viewer, width=90, height=25, font=("Courier", 10))
+        view_text.pack(fill=tk.BOTH, expand=True, padx=5)
+        state = {"offset": 0}
+
+        def show_page():
+            # Only one page is read from the BLOB handle at a time
+            blob.seek(state["offset"])
+            data = blob.read(BLOB_VIEW_PAGE)
+            if mode_var.get() == "hex":
+                content = hex_dump(data, state["offset"])
+            else:
+                content = data.decode("utf-8", errors="replace")
+            view_text.configure(state="normal")
+            view_text.delete("1.0", tk.END)
+            view_text.insert(tk.END, content)
+            view_text.configure(state="disabled")
+            end = min(size, state["offset"] + BLOB_VIEW_PAGE)
+            page_label.config(text=f"Bytes {state['offset']}-{end} of {size}")
+
+        def move(delta):
+            last_page = max(0, (size - 1) // BLOB_VIEW_PAGE * BLOB_VIEW_PAGE)
+            state["offset"] = min(max(0, state["offset"] + delta * BLOB_VIEW_PAGE), last_page)
+            show_page()
+
+        def close(event=None):
+            if event is None or event.widget is viewer:
+                blob.close()
+                conn.close()
+
+        controls = ttk.Frame(viewer)
+        controls.pack(pady=5)
+        ttk.Radiobutton(controls, text="Hex", variable=mode_var, value="hex", command=show_page).pack(side=tk.LEFT)
+        ttk.Radiobutton(controls, text="Text", variable=mode_var, value="text", command=show_page).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(controls, text="<< First", command=lambda: move(-size)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="< Prev", command=lambda: move(-1)).pack(side=tk.LEFT, padx=2)
+        page_label = ttk.Label(controls)
+        page_label.pack(side=tk.LEFT, padx=10)
+        ttk.Button(controls, text="Next >", command=lambda: move(1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Last >>", command=lambda: move(size)).pack(side=tk.LEFT, padx=2)
+        viewer.bind("<Destroy>", close)
+        show_page()
+
+    def export_blob_to_file(self, column, rowid):
+        file_path = filedialog.asksaveasfilename(title=f"Export {column}")
+        if not file_path:
+            return
+        try:
+            start = time.perf_counter()
+            conn = self.connect_db()
+            with conn.blobopen(self.current_table, column, int(rowid), readonly=True) as blob, \
+                    TRACER.span("file write", path=file_path), open(file_path, "wb") as f:
+                size = len(blob)
+                while True:
+                    chunk = blob.read(BLOB_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            conn.close()
+            self.set_status(f"Exported {size} bytes to {os.path.basename(file_path)}", operation="export_blob",
+                            duration=time.perf_counter() - start)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export value: {str(e)}")
+
+    def import_blob_from_file(self, column, rowid):
+        file_path = filedialog.askopenfilename(title=f"Import into {column}")
+        if not file_path:
+            return
+        try:
+            start = time.perf_counter()
+            size = os.path.getsize(file_path)
+            conn = self.connect_db()
+            cursor = conn.cursor()
+            # Reserve the space with zeroblob(), then stream the file into it in fixed-size chunks
+            cursor.execute(f"UPDATE {self.current_table} SET {quote_ident(column)} = zeroblob(?) WHERE rowid = ?",
+                           (size, rowid))
+            with conn.blobopen(self.current_table, column, int(rowid), readonly=False) as blob, \
+                    TRACER.span("file read", path=file_path), open(file_path, "rb") as f:
+                while True:
+                    chunk = f.read(BLOB_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    blob.write(chunk)
+            new_rows = self.fetch_grid_rows(cursor, "rowid = ?", (rowid,))
+            conn.commit()
+            conn.close()
+            self.apply_grid_changes(new_rows)
+            self.set_status(f"Imported {size} bytes into {column}", operation="import_blob",
+                            duration=time.perf_counter() - start)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import value: {str(e)}")
 
     # --------------------- Additional Features --------------------- #
+    @traced("export_table_csv")
     def export_table_csv(self):
         if not self.current_table:
             messagebox.showwarning("Warning", "Please select a table first")
@@ -588,20 +2814,23 @@ class DataManager:
                                                  title="Export Table to CSV")
         if file_path:
             try:
-                conn = sqlite3.connect(self.current_db)
+                start = time.perf_counter()
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute(f"SELECT * FROM {self.current_table}")
                 rows = cursor.fetchall()
                 cursor.execute(f"PRAGMA table_info({self.current_table})")
                 headers = [col[1] for col in cursor.fetchall()]
                 conn.close()
-                with open(file_path, "w", newline="", encoding="utf-8") as f:
+                with TRACER.span("file write", path=file_path), open(file_path, "w", newline="", encoding="utf-8") as f:
                     writer = csv.writer(f)
                     writer.writerow(headers)
                     writer.writerows(rows)
+                duration = time.perf_counter() - start
                 messagebox.showinfo("Success", f"Data exported to {file_path}")
-                self.set_status("Data exported to CSV")
+                self.set_status("Data exported to CSV", operation="export_table_csv", duration=duration, rows=len(rows))
             except Exception as e:
+                self.log_operation(f"CSV export failed: {e}", level="ERROR", operation="export_table_csv")
                 messagebox.showerror("Error", f"Failed to export data: {str(e)}")
 
     def run_query_window(self):
@@ -622,17 +2851,21 @@ class DataManager:
         results_text.pack(padx=5, pady=5)
         results_text.configure(state="disabled")
 
+        @traced("run_query")
         def execute_query():
             sql = query_text.get("1.0", tk.END).strip()
             if not sql:
                 messagebox.showwarning("Warning", "Please enter a SQL query")
                 return
             try:
-                conn = sqlite3.connect(self.current_db)
+                start = time.perf_counter()
+                row_count = None
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute(sql)
                 if sql.lower().startswith("select"):
                     rows = cursor.fetchall()
+                    row_count = len(rows)
                     headers = [description[0] for description in cursor.description]
                     output = "\t".join(headers) + "\n" + "-" * 50 + "\n"
                     for row in rows:
@@ -640,18 +2873,85 @@ class DataManager:
                 else:
                     conn.commit()
                     output = "Query executed successfully."
+                    row_count = cursor.rowcount if cursor.rowcount >= 0 else None
                 conn.close()
+                duration = time.perf_counter() - start
                 results_text.configure(state="normal")
                 results_text.delete("1.0", tk.END)
                 results_text.insert(tk.END, output)
                 results_text.configure(state="disabled")
                 self.query_history.append(sql)
-                self.set_status("Query executed")
+                self.set_status("Query executed", operation="run_query", duration=duration, rows=row_count)
             except Exception as e:
+                self.log_operation(f"Query failed: {e}", level="ERROR", operation="run_query")
                 messagebox.showerror("Error", f"Query failed: {str(e)}")
 
         ttk.Button(query_win, text="Run Query", command=execute_query).pack(pady=5)
 
+        # Execute to file: streams the result to disk on a worker thread instead of the results box
+        export_frame = ttk.Frame(query_win)
+        export_frame.pack(fill=tk.X, padx=5, pady=5)
+        export_format_var = tk.StringVar(value="CSV")
+        ttk.Combobox(export_frame, textvariable=export_format_var, values=list(QUERY_EXPORT_FORMATS),
+                     state="readonly", width=8).pack(side=tk.LEFT)
+        export_btn = ttk.Button(export_frame, text="Execute to File")
+        export_btn.pack(side=tk.LEFT, padx=5)
+        export_cancel_btn = ttk.Button(export_frame, text="Cancel", state="disabled")
+        export_cancel_btn.pack(side=tk.LEFT)
+        export_label = ttk.Label(export_frame, text="")
+        export_label.pack(side=tk.LEFT, padx=5)
+
+        def execute_to_file():
+            sql = query_text.get("1.0", tk.END).strip()
+            if not sql:
+                messagebox.showwarning("Warning", "Please enter a SQL query")
+                return
+            fmt = export_format_var.get()
+            extension = QUERY_EXPORT_FORMATS[fmt]
+            out_path = filedialog.asksaveasfilename(defaultextension=extension, parent=query_win,
+                                                    filetypes=[(f"{fmt} Files", f"*{extension}"), ("All Files", "*.*")],
+                                                    title="Execute Query to File")
+            if not out_path:
+                return
+            cancel_event = threading.Event()
+            progress_queue = queue.Queue()
+            start = time.perf_counter()
+            export_btn.config(state="disabled")
+            export_cancel_btn.config(state="normal", command=cancel_event.set)
+            export_label.config(text="Running query...")
+            self.query_history.append(sql)
+            threading.Thread(target=export_query, daemon=True,
+                             args=(self.current_db, sql, out_path, fmt, cancel_event, progress_queue)).start()
+
+            def poll():
+                while True:
+                    try:
+                        kind, payload = progress_queue.get_nowait()
+                    except queue.Empty:
+                        query_win.after(100, poll)
+                        return
+                    elapsed = max(time.perf_counter() - start, 1e-6)
+                    if kind == "rows":
+                        export_label.config(text=f"{payload} rows written, {payload / elapsed:,.0f} rows/s")
+                        continue
+                    export_btn.config(state="normal")
+                    export_cancel_btn.config(state="disabled")
+                    if kind == "error":
+                        export_label.config(text="Failed")
+                        self.log_operation(f"Query export failed: {payload}", level="ERROR", operation="export_query")
+                        messagebox.showerror("Error", f"Query export failed: {payload}", parent=query_win)
+                    elif kind == "cancelled":
+                        export_label.config(text=f"Cancelled after {payload} rows")
+                    else:
+                        export_label.config(text=f"{payload} rows written to {os.path.basename(out_path)} in "
+                                                 f"{elapsed:.1f} s ({payload / elapsed:,.0f} rows/s)")
+                        self.set_status("Query exported", operation="export_query", duration=elapsed, rows=payload)
+                    return
+
+            poll()
+
+        export_btn.config(command=execute_to_file)
+
     def show_tutorial(self):
         tutorial_window = tk.Toplevel(self.root)
         tutorial_window.title("Tutorial")
@@ -693,23 +2993,31 @@ class DataManager:
         tutorial_text.configure(state="disabled")
 
     # --------------------- Data Filtering (Search Feature) --------------------- #
+    @traced("filter_data")
     def filter_data(self, event):
-        if not hasattr(self, 'all_rows'):
-            return
-        search_term = self.search_var.get().lower()
-        self.data_tree.delete(*self.data_tree.get_children())
-        for row in self.all_rows:
-            if not search_term or any(search_term in str(cell).lower() for cell in row):
-                self.data_tree.insert("", tk.END, values=row)
+        self.rebuild_grid(self.search_var.get().lower())
 
+    @traced("reset_filters")
     def reset_filters(self):
         self.search_var.set("")
-        if hasattr(self, 'all_rows'):
-            self.data_tree.delete(*self.data_tree.get_children())
-            for row in self.all_rows:
-                self.data_tree.insert("", tk.END, values=row)
+        self.rebuild_grid("")
         self.set_status("Filters reset")
 
+    def rebuild_grid(self, search_term):
+        # Unsaved batch edits are overlaid on the saved rows so filtering never hides what Apply will write
+        self.data_tree.delete(*self.data_tree.get_children())
+        columns = self.data_tree["columns"]
+        with TRACER.span("tree insert", rows=len(self.all_rows)):
+            for iid, row in self.all_rows.items():
+                changes = self.pending_updates.get(iid)
+                values = [changes.get(col, value) for col, value in zip(columns, row)] if changes else row
+                if self.row_matches_filter(values, search_term):
+                    tags = ("deleted",) if iid in self.pending_deletes else ("dirty",) if changes else ()
+                    self.data_tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+            for iid, values in self.pending_inserts.items():
+                self.data_tree.insert("", tk.END, iid=iid, values=[values.get(col, "") for col in columns],
+                                      tags=("inserted",))
+
     # --------------------- New Feature Methods --------------------- #
     def show_about(self):
         about_text = (
@@ -747,6 +3055,7 @@ class DataManager:
         text_widget.configure(state="disabled")
         self.log_operation("Displayed Changelog")
 
+    @traced("export_schema")
     def export_schema(self):
         if not self.current_db:
             messagebox.showwarning("Warning", "Please open a database first")
@@ -755,7 +3064,7 @@ class DataManager:
                                                  title="Export Database Schema")
         if file_path:
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
                 tables = cursor.fetchall()
@@ -771,13 +3080,268 @@ class DataManager:
                         schema_text += " | ".join(str(item) for item in col) + "\n"
                     schema_text += "\n"
                 conn.close()
-                with open(file_path, "w", encoding="utf-8") as f:
+                with TRACER.span("file write", path=file_path), open(file_path, "w", encoding="utf-8") as f:
                     f.write(schema_text)
                 messagebox.showinfo("Success", f"Schema exported to {file_path}")
                 self.set_status("Schema exported")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export schema: {str(e)}")
 
+    def dump_database_dialog(self):
+        if not self.current_db:
+            messagebox.showwarning("Warning", "Please open a database first")
+            return
+        out_dir = filedialog.askdirectory(title="Select Dump Directory")
+        if not out_dir:
+            return
+
+        dump_win = tk.Toplevel(self.root)
+        dump_win.title("Dump Database")
+        options = ttk.Frame(dump_win)
+        options.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(options, text="Format:").pack(side=tk.LEFT)
+        format_var = tk.StringVar(value="CSV")
+        ttk.Combobox(options, textvariable=format_var, values=DUMP_FORMATS, state="readonly", width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Label(options, text="Workers:").pack(side=tk.LEFT)
+        workers_var = tk.IntVar(value=min(8, os.cpu_count() or 1))
+        ttk.Spinbox(options, from_=1, to=32, textvariable=workers_var, width=4).pack(side=tk.LEFT, padx=5)
+        start_btn = ttk.Button(options, text="Start")
+        start_btn.pack(side=tk.LEFT, padx=5)
+        cancel_btn = ttk.Button(options, text="Cancel", state="disabled")
+        cancel_btn.pack(side=tk.LEFT, padx=5)
+
+        progress = ttk.Progressbar(dump_win, mode="determinate")
+        progress.pack(fill=tk.X, padx=5, pady=5)
+        summary_label = ttk.Label(dump_win, text=f"Output directory: {out_dir} "
+                                                 f"(BLOBs as \\x-prefixed hex except in SQL)")
+        summary_label.pack(fill=tk.X, padx=5)
+        tables_view = ttk.Treeview(dump_win, columns=("table", "status", "rows"), show="headings", height=15)
+        for col, width in (("table", 250), ("status", 120), ("rows", 100)):
+            tables_view.heading(col, text=col.capitalize())
+            tables_view.column(col, width=width)
+        tables_view.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        start_btn.config(command=lambda: self.start_database_dump(
+            out_dir, format_var.get(), max(1, workers_var.get()), progress, summary_label, tables_view,
+            start_btn, cancel_btn))
+
+    @traced("dump_database")
+    def start_database_dump(self, out_dir, fmt, workers, progress, summary_label, tables_view, start_btn, cancel_btn):
+        # WAL snapshots copy the whole database, so preparation runs on a worker thread
+        db_path = self.current_db
+        result_queue = queue.Queue()
+        start_btn.config(state="disabled")
+        summary_label.config(text="Taking snapshot...")
+        threading.Thread(target=prepare_dump, args=(db_path, out_dir, result_queue), daemon=True).start()
+
+        def wait_for_snapshot():
+            try:
+                kind, payload = result_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(100, wait_for_snapshot)
+                return
+            alive = bool(tables_view.winfo_exists())
+            if kind == "error":
+                if alive:
+                    start_btn.config(state="normal")
+                messagebox.showerror("Error", f"Failed to start dump: {payload}")
+            elif not alive:
+                snapshot_path, snapshot_conn, tables = payload  # Window closed while preparing
+                if snapshot_conn is not None:
+                    snapshot_conn.rollback()
+                    snapshot_conn.close()
+                elif snapshot_path != db_path:
+                    os.remove(snapshot_path)
+            else:
+                self.run_database_dump(db_path, *payload, out_dir, fmt, workers, progress, summary_label,
+                                       tables_view, cancel_btn)
+
+        wait_for_snapshot()
+
+    def run_database_dump(self, db_path, snapshot_path, snapshot_conn, tables, out_dir, fmt, workers, progress,
+                          summary_label, tables_view, cancel_btn):
+        items = {table: tables_view.insert("", tk.END, values=(table, "queued", 0)) for table in tables}
+        progress.config(maximum=max(1, len(tables)), value=0)
+        cancel_event = threading.Event()
+        progress_queue = queue.Queue()
+        state = {"done": 0, "rows": {}, "errors": 0}
+        start = time.perf_counter()
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        futures = []
+        for table in tables:
+            future = executor.submit(dump_table, snapshot_path, table, out_dir, fmt, cancel_event, progress_queue)
+            future.add_done_callback(lambda f, t=table: progress_queue.put(("done", t, f)))
+            futures.append(future)
+        executor.shutdown(wait=False)
+
+        def cancel():
+            cancel_event.set()
+            for future in futures:
+                future.cancel()  # Tables not yet started are skipped entirely
+
+        cancel_btn.config(state="normal", command=cancel)
+        # Closing the window cancels the dump; polling carries on without it so the snapshot is released
+        tables_view.bind("<Destroy>", lambda event: cancel())
+
+        def finish(alive):
+            if snapshot_conn is not None:
+                snapshot_conn.rollback()
+                snapshot_conn.close()
+            elif snapshot_path != db_path:
+                os.remove(snapshot_path)
+            if alive:
+                cancel_btn.config(state="disabled")
+            duration = time.perf_counter() - start
+            total_rows = sum(state["rows"].values())
+            status = "Dump cancelled" if cancel_event.is_set() else "Database dumped"
+            self.set_status(status, operation="dump_database", duration=duration, rows=total_rows)
+            if state["errors"]:
+                messagebox.showwarning("Dump Database", f"{state['errors']} table(s) failed, see the list for details")
+
+        def poll():
+            alive = bool(tables_view.winfo_exists())
+            while True:
+                try:
+                    kind, table, payload = progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "rows":
+                    state["rows"][table] = payload
+                    if alive:
+                        tables_view.item(items[table], values=(table, "dumping", payload))
+                else:
+                    state["done"] += 1
+                    if payload.cancelled() or cancel_event.is_set():
+                        status = "cancelled"
+                    elif payload.exception() is not None:
+                        status = f"error: {payload.exception()}"
+                        state["errors"] += 1
+                    else:
+                        status = "done"
+                        state["rows"][table] = payload.result()
+                    if alive:
+                        tables_view.item(items[table], values=(table, status, state["rows"].get(table, 0)))
+            elapsed = max(time.perf_counter() - start, 1e-6)
+            total_rows = sum(state["rows"].values())
+            if alive:
+                progress.config(value=state["done"])
+                summary_label.config(text=f"{state['done']}/{len(tables)} tables, {total_rows} rows, "
+                                          f"{total_rows / elapsed:,.0f} rows/s")
+            if state["done"] < len(tables):
+                self.root.after(100, poll)
+            else:
+                finish(alive)
+
+        poll()
+
+    def copy_tables_dialog(self):
+        if not self.current_db:
+            messagebox.showwarning("Warning", "Please open a database first")
+            return
+        source_path = filedialog.askopenfilename(filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")],
+                                                 title="Select Source Database")
+        if not source_path:
+            return
+        if os.path.abspath(source_path) == os.path.abspath(self.current_db):
+            messagebox.showwarning("Warning", "Source and destination databases are the same")
+            return
+        try:
+            conn = self.connect_db(source_path, read_only=True)
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+            source_tables = [row[0] for row in cursor.fetchall()]
+            conn.close()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read source database: {str(e)}")
+            return
+
+        copy_win = tk.Toplevel(self.root)
+        copy_win.title(f"Copy Tables From {os.path.basename(source_path)}")
+        ttk.Label(copy_win, text="Tables to copy:").pack(anchor="w", padx=5, pady=(5, 0))
+        tables_list = tk.Listbox(copy_win, selectmode=tk.EXTENDED, height=12, exportselection=False)
+        for table in source_tables:
+            tables_list.insert(tk.END, table)
+        tables_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        options = ttk.Frame(copy_win)
+        options.pack(fill=tk.X, padx=5)
+        ttk.Label(options, text="Row filter (WHERE):").grid(row=0, column=0, sticky="w")
+        where_entry = ttk.Entry(options, width=40)
+        where_entry.grid(row=0, column=1, sticky="ew", padx=5, pady=2)
+        ttk.Label(options, text="Rows per chunk:").grid(row=1, column=0, sticky="w")
+        chunk_var = tk.IntVar(value=COPY_CHUNK_ROWS)
+        ttk.Spinbox(options, from_=1000, to=10000000, increment=10000, textvariable=chunk_var, width=12).grid(
+            row=1, column=1, sticky="w", padx=5, pady=2)
+        append_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options, text="Append into existing tables", variable=append_var).grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=2)
+
+        progress = ttk.Progressbar(copy_win, mode="determinate", maximum=1.0)
+        progress.pack(fill=tk.X, padx=5, pady=5)
+        status_label = ttk.Label(copy_win, text="Select tables and press Copy")
+        status_label.pack(fill=tk.X, padx=5)
+        buttons = ttk.Frame(copy_win)
+        buttons.pack(pady=5)
+        copy_btn = ttk.Button(buttons, text="Copy")
+        copy_btn.pack(side=tk.LEFT, padx=2)
+        cancel_btn = ttk.Button(buttons, text="Cancel", state="disabled")
+        cancel_btn.pack(side=tk.LEFT, padx=2)
+
+        def start_copy():
+            tables = [tables_list.get(i) for i in tables_list.curselection()]
+            if not tables:
+                messagebox.showwarning("Warning", "Please select at least one table", parent=copy_win)
+                return
+            cancel_event = threading.Event()
+            progress_queue = queue.Queue()
+            state = {"index": 0, "rows": 0, "table_rows": 0, "errors": []}
+            start = time.perf_counter()
+            copy_btn.config(state="disabled")
+            cancel_btn.config(state="normal", command=cancel_event.set)
+            threading.Thread(target=copy_tables, daemon=True,
+                             args=(self.current_db, source_path, tables, where_entry.get().strip(),
+                                   append_var.get(), max(1, chunk_var.get()), cancel_event, progress_queue)).start()
+
+            def poll():
+                finished = False
+                while True:
+                    try:
+                        kind, table, payload = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "progress":
+                        fraction, state["table_rows"] = payload
+                        progress.config(value=(state["index"] + fraction) / len(tables))
+                        status_label.config(text=f"Copying {table}: {state['rows'] + state['table_rows']} rows")
+                    elif kind in ("done", "error"):
+                        state["index"] += 1
+                        state["rows"] += state["table_rows"]
+                        state["table_rows"] = 0
+                        if kind == "error":
+                            state["errors"].append(f"{table}: {payload}")
+                    else:
+                        finished = True
+                if not finished:
+                    copy_win.after(100, poll)
+                    return
+                duration = time.perf_counter() - start
+                progress.config(value=state["index"] / len(tables))
+                cancel_btn.config(state="disabled")
+                status_label.config(text=f"{state['index']}/{len(tables)} tables, {state['rows']} rows "
+                                         f"in {duration:.1f} s")
+                self.load_tables()
+                self.set_status("Table copy cancelled" if cancel_event.is_set() else "Tables copied",
+                                operation="copy_tables", duration=duration, rows=state["rows"])
+                if state["errors"]:
+                    messagebox.showwarning("Copy Tables", "Some tables failed:\n" + "\n".join(state["errors"]),
+                                           parent=copy_win)
+
+            poll()
+
+        copy_btn.config(command=start_copy)
+
+    @traced("run_sql_script")
     def run_sql_script(self):
         if not self.current_db:
             messagebox.showwarning("Warning", "Please open a database first")
@@ -785,9 +3349,9 @@ class DataManager:
         file_path = filedialog.askopenfilename(filetypes=[("SQL Files", "*.sql")], title="Select SQL Script")
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
+                with TRACER.span("file read", path=file_path), open(file_path, "r", encoding="utf-8") as f:
                     script = f.read()
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.executescript(script)
                 conn.commit()
@@ -797,6 +3361,7 @@ class DataManager:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to execute script: {str(e)}")
 
+    @traced("import_json")
     def import_json(self):
         if not self.current_table:
             messagebox.showwarning("Warning", "Please select a table to import data into")
@@ -804,33 +3369,39 @@ class DataManager:
         file_path = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json")], title="Select JSON File")
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
+                with TRACER.span("file read", path=file_path), open(file_path, "r", encoding="utf-8") as f:
                     data = json.load(f)
                 # Expecting a list of dictionaries
                 if not isinstance(data, list):
                     raise ValueError("JSON data must be a list of objects")
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
+                last_rowid = self.max_rowid(cursor)
                 for item in data:
                     keys = item.keys()
                     placeholders = ", ".join(["?"] * len(keys))
                     columns = ", ".join(keys)
                     query = f"INSERT INTO {self.current_table} ({columns}) VALUES ({placeholders})"
                     cursor.execute(query, tuple(item[key] for key in keys))
+                new_rows = self.fetch_grid_rows(cursor, "rowid > ?", (last_rowid,))
                 conn.commit()
                 conn.close()
-                self.load_table_data(None)
+                if self.grid_has_rowid and len(new_rows) != len(data):
+                    self.load_table_data(None)  # Explicit keys below MAX(rowid) are missed by "rowid > ?"
+                else:
+                    self.apply_grid_changes(new_rows)
                 messagebox.showinfo("Success", f"Data imported from {file_path}")
                 self.set_status("JSON data imported")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to import JSON: {str(e)}")
 
+    @traced("generate_sample_data")
     def generate_sample_data(self):
         if not self.current_table:
             messagebox.showwarning("Warning", "Please select a table to generate sample data into")
             return
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             # This is a simple sample insertion. In a real scenario, generate data based on schema.
             cursor.execute(f"PRAGMA table_info({self.current_table})")
@@ -838,9 +3409,10 @@ class DataManager:
             sample_values = ["Sample" for _ in columns]
             query = f"INSERT INTO {self.current_table} ({', '.join(columns)}) VALUES ({', '.join(['?']*len(columns))})"
             cursor.execute(query, sample_values)
+            new_rows = self.fetch_grid_rows(cursor, "rowid = ?", (cursor.lastrowid,))
             conn.commit()
             conn.close()
-            self.load_table_data(None)
+            self.apply_grid_changes(new_rows)
             messagebox.showinfo("Success", "Sample data generated successfully")
             self.set_status("Sample data generated")
         except Exception as e:
@@ -852,7 +3424,7 @@ class DataManager:
             return
         if messagebox.askyesno("Confirm", "Are you sure you want to drop ALL tables? This action cannot be undone."):
             try:
-                conn = sqlite3.connect(self.current_db)
+                conn = self.connect_db()
                 cursor = conn.cursor()
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
                 tables = cursor.fetchall()
@@ -866,34 +3438,44 @@ class DataManager:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to drop all tables: {str(e)}")
 
+    @traced("undo_last_operation")
     def undo_last_operation(self):
         if not self.last_operation:
             messagebox.showinfo("Info", "No operation to undo")
             return
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             op = self.last_operation
+            new_rows, removed = [], []
             if op["action"] == "add":
-                # For an add, delete the last inserted row using primary key if possible
-                primary_key = self.get_primary_key()
-                cursor.execute(f"DELETE FROM {self.current_table} WHERE {primary_key} = (SELECT {primary_key} FROM {self.current_table} ORDER BY {primary_key} DESC LIMIT 1)")
+                if op.get("rowid") is not None:
+                    # The inserted rowid is known, so remove exactly that row
+                    cursor.execute(f"DELETE FROM {self.current_table} WHERE rowid = ?", (op["rowid"],))
+                    removed.append(str(op["rowid"]))
+                else:
+                    # For an add, delete the last inserted row using primary key if possible
+                    primary_key = self.get_primary_key()
+                    cursor.execute(f"DELETE FROM {self.current_table} WHERE {primary_key} = (SELECT {primary_key} FROM {self.current_table} ORDER BY {primary_key} DESC LIMIT 1)")
             elif op["action"] == "delete":
                 # For delete, re-insert deleted rows (this is basic and may not restore auto-incremented keys)
-                columns = [f"col{i}" for i in range(1, len(op["rows"][0])+1)]
                 for row in op["rows"]:
                     placeholders = ", ".join(["?"] * len(row))
                     query = f"INSERT INTO {self.current_table} VALUES ({placeholders})"
                     cursor.execute(query, row)
+                    new_rows += self.fetch_grid_rows(cursor, "rowid = ?", (cursor.lastrowid,))
             elif op["action"] == "edit":
                 # For edit, revert to old values
+                primary_key = op.get("pk_column") or self.get_primary_key()
                 set_clause = ", ".join([f"{col} = ?" for col in op["columns"]])
-                query = f"UPDATE {self.current_table} SET {set_clause} WHERE {self.get_primary_key()} = ?"
-                cursor.execute(query, op["old"] + [op["pk"]])
+                query = f"UPDATE {self.current_table} SET {set_clause} WHERE {primary_key} = ?"
+                cursor.execute(query, list(op["old"]) + [op["pk"]])
+                if primary_key == "rowid":
+                    new_rows = self.fetch_grid_rows(cursor, "rowid = ?", (op["pk"],))
             conn.commit()
             conn.close()
             self.last_operation = None
-            self.load_table_data(None)
+            self.apply_grid_changes(new_rows, removed)
             messagebox.showinfo("Success", "Undo successful")
             self.set_status("Last operation undone")
         except Exception as e:
@@ -905,7 +3487,7 @@ class DataManager:
             return
         try:
             file_size = os.path.getsize(self.current_db)
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
             table_count = cursor.fetchone()[0]
@@ -931,7 +3513,7 @@ class DataManager:
             messagebox.showwarning("Warning", "Please select a table")
             return
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute(f"SELECT COUNT(*) FROM {self.current_table}")
             count = cursor.fetchone()[0]
@@ -946,7 +3528,7 @@ class DataManager:
             messagebox.showwarning("Warning", "No database open")
             return
         try:
-            conn = sqlite3.connect(self.current_db)
+            conn = self.connect_db()
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = [table[0] for table in cursor.fetchall()]
@@ -979,14 +3561,334 @@ class DataManager:
         doc_text.configure(state="disabled")
         self.log_operation("Displayed Documentation")
 
+    # --------------------- Incremental Backups --------------------- #
+    def show_backup_repository(self):
+        if not self.current_db:
+            messagebox.showwarning("Warning", "Please open a database first")
+            return
+        db_path = os.path.abspath(self.current_db)
+        repositories = self.settings.setdefault("backup_repositories", {})
+        state = {"repo": repositories.get(db_path, backup_repository_path(db_path)), "snapshots": []}
+
+        backup_win = tk.Toplevel(self.root)
+        backup_win.title(f"Incremental Backups - {os.path.basename(db_path)}")
+        repo_frame = ttk.Frame(backup_win)
+        repo_frame.pack(fill=tk.X, padx=5, pady=5)
+        repo_label = ttk.Label(repo_frame, text=f"Repository: {state['repo']}")
+        repo_label.pack(side=tk.LEFT)
+        try:
+            wal = uses_wal(db_path)
+        except OSError:
+            wal = False
+        if wal:
+            ttk.Label(backup_win, text="WAL mode: each snapshot first copies the whole database into the repository "
+                                       "(extra writes equal to the database size).").pack(anchor="w", padx=5)
+
+        options = ttk.Frame(backup_win)
+        options.pack(fill=tk.X, padx=5)
+        ttk.Label(options, text="Compression:").pack(side=tk.LEFT)
+        codec_var = tk.StringVar(value=self.settings.get("backup_codec", "zlib"))
+        ttk.Combobox(options, textvariable=codec_var, values=list(BACKUP_CODECS), state="readonly",
+                     width=6).pack(side=tk.LEFT, padx=5)
+        ttk.Label(options, text="Keep last (0 = all):").pack(side=tk.LEFT)
+        keep_var = tk.IntVar(value=self.settings.get("backup_keep", BACKUP_KEEP_SNAPSHOTS))
+        ttk.Spinbox(options, from_=0, to=10000, textvariable=keep_var, width=6).pack(side=tk.LEFT, padx=5)
+
+        snapshots_view = ttk.Treeview(backup_win, show="headings", height=12,
+                                      columns=("id", "created", "changed", "stored", "throughput"))
+        for col, text, width in (("id", "Snapshot", 70), ("created", "Created", 150),
+                                 ("changed", "Changed Pages", 140), ("stored", "Stored", 90),
+                                 ("throughput", "Backup Speed", 110)):
+            snapshots_view.heading(col, text=text)
+            snapshots_view.column(col, width=width)
+        snapshots_view.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        progress = ttk.Progressbar(backup_win, mode="determinate", maximum=1.0)
+        progress.pack(fill=tk.X, padx=5)
+        status_label = ttk.Label(backup_win, text="")
+        status_label.pack(fill=tk.X, padx=5, pady=2)
+        buttons = ttk.Frame(backup_win)
+        buttons.pack(pady=5)
+
+        def refresh():
+            snapshots_view.delete(*snapshots_view.get_children())
+            try:
+                state["snapshots"] = list_snapshots(state["repo"])
+            except (OSError, ValueError) as e:
+                state["snapshots"] = []
+                status_label.config(text=f"Failed to read repository: {e}")
+            total = 0
+            for snapshot in reversed(state["snapshots"]):
+                total += snapshot["stored_bytes"]
+                speed = snapshot["read_bytes"] / max(snapshot["seconds"], 1e-6)
+                snapshots_view.insert("", tk.END, iid=str(snapshot["id"]), values=(
+                    snapshot["id"], snapshot["created"], f"{snapshot['changed_pages']}/{snapshot['page_count']}",
+                    format_size(snapshot["stored_bytes"]), f"{format_size(speed)}/s"))
+            if state["snapshots"]:
+                status_label.config(text=f"{len(state['snapshots'])} snapshots, {format_size(total)} stored")
+
+        def remember_options():
+            self.settings["backup_codec"] = codec_var.get()
+            self.settings["backup_keep"] = max(0, keep_var.get())
+            self.save_settings()
+
+        def run_job(job, args, on_done, running_text):
+            cancel_event = threading.Event()
+            progress_queue = queue.Queue()
+            for button in job_buttons:
+                button.config(state="disabled")
+            cancel_btn.config(state="normal", command=cancel_event.set)
+            progress.config(value=0)
+            status_label.config(text=running_text)
+            threading.Thread(target=run_backup_job, daemon=True,
+                             args=(job, args + (cancel_event, progress_queue), progress_queue)).start()
+
+            def poll():
+                while True:
+                    try:
+                        kind, payload = progress_queue.get_nowait()
+                    except queue.Empty:
+                        backup_win.after(100, poll)
+                        return
+                    if kind == "progress":
+                        progress.config(value=payload)
+                        continue
+                    for button in job_buttons:
+                        button.config(state="normal")
+                    cancel_btn.config(state="disabled")
+                    if kind == "error":
+                        status_label.config(text="Failed")
+                        messagebox.showerror("Error", payload, parent=backup_win)
+                    elif payload is None:
+                        status_label.config(text="Cancelled")
+                    else:
+                        progress.config(value=1.0)
+                        on_done(payload)
+                    return
+
+            poll()
+
+        def create():
+            remember_options()
+
+            def done(manifest):
+                keep = max(0, keep_var.get())
+                removed, freed = prune_snapshots(state["repo"], keep)
+                refresh()
+                speed = manifest["read_bytes"] / max(manifest["seconds"], 1e-6)
+                status_label.config(text=f"Snapshot {manifest['id']}: {manifest['changed_pages']} of "
+                                         f"{manifest['page_count']} pages changed, "
+                                         f"{format_size(manifest['stored_bytes'])} stored, "
+                                         f"{format_size(speed)}/s; pruned {removed} ({format_size(freed)})")
+                self.set_status("Incremental backup created", operation="incremental_backup",
+                                duration=manifest["seconds"], rows=manifest["changed_pages"])
+
+            run_job(create_snapshot, (db_path, state["repo"], codec_var.get()), done, "Creating snapshot...")
+
+        def restore():
+            selected = snapshots_view.selection()
+            if not selected:
+                messagebox.showwarning("Warning", "Please select a snapshot to restore", parent=backup_win)
+                return
+            snapshot = next(snap for snap in state["snapshots"] if str(snap["id"]) == selected[0])
+            dest_path = filedialog.asksaveasfilename(defaultextension=".db", filetypes=[("SQLite Database", "*.db")],
+                                                     title="Restore Snapshot As", parent=backup_win)
+            if not dest_path:
+                return
+            if os.path.abspath(dest_path) == db_path:
+                messagebox.showwarning("Warning", "Restore to another file; the open database cannot be replaced",
+                                       parent=backup_win)
+                return
+
+            def done(result):
+                speed = result["bytes"] / max(result["seconds"], 1e-6)
+                status_label.config(text=f"Snapshot {snapshot['id']} restored to {dest_path}: "
+                                         f"{format_size(result['bytes'])} in {result['seconds']:.1f} s, "
+                                         f"{format_size(speed)}/s")
+                self.set_status("Snapshot restored", operation="restore_snapshot",
+                                duration=result["seconds"], rows=result["pages"])
+
+            run_job(restore_snapshot, (state["repo"], snapshot, dest_path), done,
+                    f"Restoring snapshot {snapshot['id']}...")
+
+        def prune():
+            remember_options()
+            try:
+                removed, freed = prune_snapshots(state["repo"], max(0, keep_var.get()))
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to prune repository: {str(e)}", parent=backup_win)
+                return
+            refresh()
+            status_label.config(text=f"Pruned {removed} snapshots, freed {format_size(freed)}")
+
+        def change_repository():
+            repo = filedialog.askdirectory(title="Select Backup Repository", parent=backup_win)
+            if repo:
+                state["repo"] = repo
+                repositories[db_path] = repo
+                self.save_settings()
+                repo_label.config(text=f"Repository: {repo}")
+                refresh()
+
+        job_buttons = [ttk.Button(buttons, text="Create Snapshot", command=create),
+                       ttk.Button(buttons, text="Restore Selected...", command=restore),
+                       ttk.Button(buttons, text="Prune Now", command=prune),
+                       ttk.Button(repo_frame, text="Change...", command=change_repository)]
+        for button in job_buttons[:3]:
+            button.pack(side=tk.LEFT, padx=2)
+        job_buttons[3].pack(side=tk.RIGHT)
+        cancel_btn = ttk.Button(buttons, text="Cancel", state="disabled")
+        cancel_btn.pack(side=tk.LEFT, padx=2)
+        refresh()
+
+    # --------------------- Performance Panel --------------------- #
+    def show_performance_panel(self):
+        perf_win = tk.Toplevel(self.root)
+        perf_win.title("Performance")
+
+        controls = ttk.Frame(perf_win)
+        controls.pack(fill=tk.X, padx=5, pady=5)
+        enabled_var = tk.BooleanVar(value=TRACER.enabled)
+
+        def toggle_tracing():
+            TRACER.enabled = enabled_var.get()
+            self.log_operation("Tracing enabled" if TRACER.enabled else "Tracing disabled", operation="trace")
+
+        ttk.Checkbutton(controls, text="Enable tracing", variable=enabled_var, command=toggle_tracing).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Clear", command=lambda: (TRACER.clear(), refresh())).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Export Chrome Trace", command=self.export_chrome_trace).pack(side=tk.LEFT, padx=2)
+
+        # Recent spans, indented by nesting depth
+        spans_frame = ttk.LabelFrame(perf_win, text="Recent Spans")
+        spans_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        spans_tree = ttk.Treeview(spans_frame, columns=("span", "duration", "details"), show="headings", height=15)
+        for col, width in (("span", 250), ("duration", 100), ("details", 400)):
+            spans_tree.heading(col, text=col.capitalize())
+            spans_tree.column(col, width=width)
+        spans_tree.pack(fill=tk.BOTH, expand=True)
+
+        # Aggregated totals per span name
+        totals_frame = ttk.LabelFrame(perf_win, text="Totals by Span")
+        totals_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        totals_tree = ttk.Treeview(totals_frame, columns=("span", "count", "total", "average", "max"), show="headings", height=8)
+        for col, width in (("span", 200), ("count", 80), ("total", 100), ("average", 100), ("max", 100)):
+            totals_tree.heading(col, text=col.capitalize())
+            totals_tree.column(col, width=width)
+        totals_tree.pack(fill=tk.BOTH, expand=True)
+
+        def refresh():
+            records = list(TRACER.records)
+            recent = sorted(records[-PERF_PANEL_SPANS:], key=lambda record: record.start)
+            spans_tree.delete(*spans_tree.get_children())
+            for record in recent:
+                details = ", ".join(f"{key}={value}" for key, value in record.args.items())
+                spans_tree.insert("", tk.END, values=("    " * record.depth + record.name,
+                                                      f"{record.duration * 1000:.2f} ms", details))
+            totals = {}
+            for record in records:
+                count, total, longest = totals.get(record.name, (0, 0.0, 0.0))
+                totals[record.name] = (count + 1, total + record.duration, max(longest, record.duration))
+            totals_tree.delete(*totals_tree.get_children())
+            for name, (count, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+                totals_tree.insert("", tk.END, values=(name, count, f"{total * 1000:.2f} ms",
+                                                       f"{total / count * 1000:.2f} ms", f"{longest * 1000:.2f} ms"))
+
+        def auto_refresh():
+            if not perf_win.winfo_exists():
+                return
+            if TRACER.enabled:
+                refresh()
+            perf_win.after(1000, auto_refresh)
+
+        refresh()
+        auto_refresh()
+
+    def export_chrome_trace(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Trace JSON", "*.json")],
+                                                 title="Export Chrome Trace")
+        if file_path:
+            try:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    json.dump(TRACER.to_chrome_trace(), f)
+                messagebox.showinfo("Success", f"Trace exported to {file_path}")
+                self.set_status("Trace exported", operation="trace", rows=len(TRACER.records))
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export trace: {str(e)}")
+
     def view_log(self):
+        self.log_operation("Viewed application log")
         log_win = tk.Toplevel(self.root)
         log_win.title("Application Log")
-        log_text = scrolledtext.ScrolledText(log_win, width=80, height=20)
-        log_text.pack(fill=tk.BOTH, expand=True)
-        log_text.insert(tk.END, "\n".join(self.log))
-        log_text.configure(state="disabled")
-        self.log_operation("Viewed application log")
+
+        # Filter bar: level and free-text filter
+        filter_frame = ttk.Frame(log_win)
+        filter_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(filter_frame, text="Level:").pack(side=tk.LEFT)
+        level_var = tk.StringVar(value="ALL")
+        level_box = ttk.Combobox(filter_frame, textvariable=level_var, values=LOG_LEVELS, state="readonly", width=10)
+        level_box.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        text_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=text_var)
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        columns = ("time", "level", "operation", "database", "duration", "rows", "message")
+        log_tree = ttk.Treeview(log_win, columns=columns, show="headings", height=20)
+        for col, width in zip(columns, (140, 60, 120, 120, 80, 60, 400)):
+            log_tree.heading(col, text=col.capitalize())
+            log_tree.column(col, width=width)
+        log_tree.pack(fill=tk.BOTH, expand=True, padx=5)
+
+        # Paging controls
+        page_frame = ttk.Frame(log_win)
+        page_frame.pack(pady=5)
+        page_label = ttk.Label(page_frame)
+        state = {"page": 0, "entries": []}
+
+        def apply_filter(*_):
+            level = level_var.get()
+            term = text_var.get().lower()
+            entries = []
+            # Newest entries first
+            for entry in reversed(list(self.log)):
+                if level != "ALL" and entry.level != level:
+                    continue
+                if term and term not in self.format_log_entry(entry).lower():
+                    continue
+                entries.append(entry)
+            state["entries"] = entries
+            state["page"] = 0
+            show_page()
+
+        def show_page():
+            entries = state["entries"]
+            page_count = max(1, (len(entries) + LOG_PAGE_SIZE - 1) // LOG_PAGE_SIZE)
+            state["page"] = min(max(state["page"], 0), page_count - 1)
+            first = state["page"] * LOG_PAGE_SIZE
+            log_tree.delete(*log_tree.get_children())
+            for entry in entries[first:first + LOG_PAGE_SIZE]:
+                log_tree.insert("", tk.END, values=(
+                    entry.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                    entry.level,
+                    entry.operation,
+                    entry.database,
+                    "" if entry.duration is None else f"{entry.duration * 1000:.1f} ms",
+                    "" if entry.rows is None else entry.rows,
+                    entry.message,
+                ))
+            page_label.config(text=f"Page {state['page'] + 1} of {page_count} ({len(entries)} entries)")
+
+        def change_page(delta):
+            state["page"] += delta
+            show_page()
+
+        ttk.Button(page_frame, text="< Prev", command=lambda: change_page(-1)).pack(side=tk.LEFT, padx=2)
+        page_label.pack(side=tk.LEFT, padx=10)
+        ttk.Button(page_frame, text="Next >", command=lambda: change_page(1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(page_frame, text="Refresh", command=apply_filter).pack(side=tk.LEFT, padx=2)
+
+        level_box.bind("<<ComboboxSelected>>", apply_filter)
+        filter_entry.bind("<Return>", apply_filter)
+        apply_filter()
 
 if __name__ == "__main__":
     root = tk.Tk()